@@ -0,0 +1,157 @@
+"""
+On-disk result cache shared by the file scanning hooks.
+
+Results are stored as JSON under .git/hooks-cache/<namespace>/ and keyed by the
+file's path, modification time and size, so files that did not change since the
+last commit are not read or scanned again. The hook's own source, and that of
+the shared modules it loaded from the hooks directory, are part of the key,
+which invalidates every entry whenever the hook (or its patterns) change.
+A scan that reports an error calls skip_caching, so its result is not stored
+and the file is scanned again on the next run.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Callable, Optional, Set
+
+# Cache location, relative to the repository root pre-commit runs hooks from
+CACHE_DIR = os.path.join('.git', 'hooks-cache')
+
+# Entries kept per namespace; the least recently used ones are dropped first
+MAX_ENTRIES = 4096
+
+# Set to disable the cache entirely
+DISABLE_ENV_VAR = 'PRE_COMMIT_HOOKS_NO_CACHE'
+
+_MISS = object()
+_pruned: Set[str] = set()
+
+# Set by skip_caching during the cached call in progress
+_skip_store = False
+
+
+def _cache_dir(namespace: str) -> Optional[str]:
+    """Return the cache directory for a namespace, or None if caching is off."""
+    if os.environ.get(DISABLE_ENV_VAR):
+        return None
+    if not os.path.isdir(os.path.dirname(CACHE_DIR)):
+        return None
+    return os.path.join(CACHE_DIR, namespace)
+
+
+def _source_signature(func: Callable) -> str:
+    """Identify the version of the module defining func and of its shared modules."""
+    # The module file rather than func.__code__, which compiled builds lack
+    module_file = getattr(sys.modules.get(func.__module__), '__file__', None)
+    if not module_file:
+        return ''
+
+    hooks_dir = os.path.dirname(os.path.abspath(module_file))
+    files = {os.path.abspath(module_file)}
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None)
+        if path and os.path.dirname(os.path.abspath(path)) == hooks_dir:
+            files.add(os.path.abspath(path))
+
+    signature = []
+    for path in sorted(files):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append(f"{os.path.basename(path)}:{stat.st_mtime_ns}:{stat.st_size}")
+    return ','.join(signature)
+
+
+def _entry_path(directory: str, signature: str, file_path: str, args: tuple) -> Optional[str]:
+    """Build the entry file name for a file in its current state."""
+    try:
+        stat = os.stat(file_path)
+    except (OSError, ValueError):
+        return None
+    key = json.dumps([signature, file_path, stat.st_mtime_ns, stat.st_size, list(args)])
+    return os.path.join(directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+
+def _read(entry: str) -> Any:
+    """Load an entry and mark it as recently used."""
+    try:
+        with open(entry, 'r', encoding='utf-8') as f:
+            value = json.load(f)
+        os.utime(entry)
+        return value
+    except (OSError, ValueError):
+        return _MISS
+
+
+def _prune(directory: str) -> None:
+    """Drop the least recently used entries once a namespace grows too large."""
+    try:
+        entries = [os.path.join(directory, name) for name in os.listdir(directory)]
+        if len(entries) <= MAX_ENTRIES:
+            return
+        entries.sort(key=os.path.getmtime)
+        for entry in entries[:len(entries) - MAX_ENTRIES * 3 // 4]:
+            os.remove(entry)
+    except OSError:
+        pass
+
+
+def _write(directory: str, entry: str, value: Any) -> None:
+    """Store an entry atomically; failures only cost a cache miss later."""
+    tmp_path = f"{entry}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f)
+        os.replace(tmp_path, entry)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+
+    if directory not in _pruned:
+        _pruned.add(directory)
+        _prune(directory)
+
+
+def skip_caching() -> None:
+    """Keep the result of the cached call in progress out of the cache, e.g. after an error."""
+    global _skip_store
+    _skip_store = True
+
+
+def cached_by_stat(namespace: str, decode: Callable[[Any], Any] = lambda value: value) -> Callable:
+    """
+    Cache the JSON-serializable result of ``func(file_path, *args)`` on disk.
+    `decode` rebuilds the original result (e.g. tuples) from the stored JSON.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = _source_signature(func)
+
+        @functools.wraps(func)
+        def wrapper(file_path: str, *args: Any) -> Any:
+            directory = _cache_dir(namespace)
+            entry = _entry_path(directory, signature, file_path, args) if directory else None
+            if directory is None or entry is None:
+                return func(file_path, *args)
+
+            value = _read(entry)
+            if value is not _MISS:
+                return decode(value)
+
+            global _skip_store
+            _skip_store = False
+            result = func(file_path, *args)
+            if not _skip_store:
+                _write(directory, entry, result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,25 @@
+"""
+Hand off to a mypyc-compiled build of a hook when one is installed.
+
+pre-commit runs the hooks as scripts, which always executes the .py source.
+When the package was built with PRE_COMMIT_HOOKS_MYPYC=1 (see setup.py), the
+installed hooks package holds compiled extension modules and their main() is
+used instead. Without one the script simply runs its own main().
+"""
+
+import importlib
+import importlib.machinery
+import importlib.util
+from typing import Callable, Optional
+
+
+def compiled_main(module: str) -> Optional[Callable[[], int]]:
+    """Return main() of the compiled hooks.<module>, or None if there is none."""
+    try:
+        spec = importlib.util.find_spec(f'hooks.{module}')
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not isinstance(spec.loader, importlib.machinery.ExtensionFileLoader):
+        return None
+    main: Callable[[], int] = importlib.import_module(spec.name).main
+    return main
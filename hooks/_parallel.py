@@ -0,0 +1,51 @@
+"""
+Run a per-file check over many files using worker processes.
+
+The checks are CPU-bound regex work and every file is independent, so the hooks
+hand their file lists to map_files instead of looping serially. Forked workers
+inherit the pattern tables the hook compiled before starting the pool; under the
+spawn start method (the default on macOS and Windows) each worker re-imports the
+hook and compiles its own.
+
+Pre-commit would otherwise split the file list across about one process per
+core, each starting its own pool, so the hooks that call map_files are marked
+require_serial in .pre-commit-hooks.yaml.
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator, Sequence
+
+# Below this many files, starting the workers costs more than it saves
+MIN_FILES = 16
+
+# Workers beyond this mostly contend for memory bandwidth
+MAX_WORKERS = 8
+
+
+def _pool_map(executor: ProcessPoolExecutor, func: Callable[..., Any], files: Sequence[str], args: tuple,
+              chunksize: int) -> Iterator[Any]:
+    """Yield the executor's results in file order, shutting it down afterwards."""
+    with executor:
+        arg_columns = [itertools.repeat(arg) for arg in args]
+        yield from executor.map(func, files, *arg_columns, chunksize=chunksize)
+
+
+def map_files(func: Callable[..., Any], files: Sequence[str], args: tuple = (), chunksize: int = 8) -> Iterator[Any]:
+    """
+    Yield func(file, *args) for each file in order, computed across CPU cores.
+    Each result is yielded as soon as it and those before it are ready, so
+    callers can report on early files while later ones are still scanned.
+    """
+    workers = min(os.cpu_count() or 1, MAX_WORKERS, len(files))
+    if len(files) < MIN_FILES or workers < 2:
+        return (func(file_path, *args) for file_path in files)
+
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError):
+        # No multiprocessing support on this platform/sandbox
+        return (func(file_path, *args) for file_path in files)
+
+    return _pool_map(executor, func, files, args, chunksize)
@@ -0,0 +1,490 @@
+"""
+Pattern scanning shared by the line-oriented security hooks.
+
+The credential, Ansible, URL, verbose flag and .NET scanners all check a
+file against named lists of regexes and report matches per line. Each keeps its own pattern table; this
+module compiles a table once at import, finds the few lines some pattern can
+match without splitting the file into lines, and hands those lines back for
+the individual patterns to verify. Hyperscan or RE2, when installed, can
+replace the re gate with a single linear pass over the encoded file.
+"""
+
+import heapq
+import itertools
+import mmap
+import re
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
+
+# Optional: Hyperscan matches every pattern of a table in a single pass
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Optional: RE2 runs an alternation in linear time, however many patterns it joins
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Engines a line gate can run on; re is always available
+ENGINES = ('re', 're2', 'hyperscan')
+
+# Files are scanned in blocks of about this many bytes, cut at line breaks
+BLOCK_SIZE = 1 << 20
+
+# Leading bytes searched for a NUL to recognise binary files, as git does
+BINARY_SNIFF_SIZE = 4096
+
+# A pattern that is plain text, apart from backslash-escaped punctuation
+_LITERAL_PATTERN = re.compile(r'(?:\\[^A-Za-z0-9]|[^\\.^$*+?{}\[\]|()])*')
+_ESCAPE = re.compile(r'\\(.)')
+
+# Bytes on which a bytes pattern can disagree with its str form: anything
+# non-ASCII, and the \x1c-\x1f separators that str \s also matches
+_NOT_PLAIN_ASCII = re.compile(b'[\x1c-\x1f\x80-\xff]')
+
+# Bytes where RE2's and Hyperscan's \s, \w, \d and \b can disagree with re's
+# str forms, which also match \v and \x1c-\x1f, and Unicode letters and digits
+_ENGINE_BLIND_SPOT = re.compile(b'[\x0b\x1c-\x1f\x80-\xff]')
+
+
+def compile_patterns(patterns: Dict[str, List[str]], flags: int = re.IGNORECASE) -> Dict[str, List[Pattern[str]]]:
+    """Compile every pattern of a name -> patterns table."""
+    return {
+        name: [re.compile(pattern, flags) for pattern in name_patterns]
+        for name, name_patterns in patterns.items()
+    }
+
+
+def compile_literals(patterns: Dict[str, List[str]]) -> Dict[str, List[Optional[str]]]:
+    r"""
+    For each pattern of a table, the lowercase text it matches if it is a
+    plain ASCII literal such as r'console\.debug\(', or None.
+    """
+    literals: Dict[str, List[Optional[str]]] = {}
+    for name, name_patterns in patterns.items():
+        literals[name] = [
+            _ESCAPE.sub(r'\1', pattern).lower()
+            if pattern.isascii() and _LITERAL_PATTERN.fullmatch(pattern) else None
+            for pattern in name_patterns
+        ]
+    return literals
+
+
+def matching_patterns(
+    line: str,
+    compiled: Dict[str, List[Pattern[str]]],
+    literals: Dict[str, List[Optional[str]]],
+) -> Iterator[str]:
+    """
+    Yield the table name of every pattern that matches line, in table order;
+    a name repeats when several of its patterns match.
+
+    For a table compiled with re.IGNORECASE, a literal pattern matches an ASCII
+    line exactly when its text is in the lowercased line, which is much
+    cheaper than a regex search.  Other lines are searched with the regex,
+    since case-insensitive matching also folds a few non-ASCII letters.
+    """
+    line_lower = line.lower() if line.isascii() else None
+    for name, name_patterns in compiled.items():
+        for pattern, literal in zip(name_patterns, literals[name]):
+            if literal is not None and line_lower is not None:
+                if literal in line_lower:
+                    yield name
+            elif pattern.search(line):
+                yield name
+
+
+def compile_union(patterns: Dict[str, List[str]], flags: int = re.IGNORECASE) -> Pattern[str]:
+    """
+    Join every pattern of a table into one alternation.  It only says where
+    some pattern can match; hits must be re-checked with the patterns
+    themselves, which also reports every pattern matching the same line.
+    """
+    return re.compile(
+        '|'.join(f'(?:{pattern})' for name_patterns in patterns.values() for pattern in name_patterns),
+        flags
+    )
+
+
+def compile_bytes_union(patterns: Dict[str, List[str]], flags: int = re.IGNORECASE) -> Pattern[bytes]:
+    """compile_union for searching undecoded file data; see read_text."""
+    return re.compile(
+        b'|'.join(
+            b'(?:' + pattern.encode('ascii') + b')'
+            for name_patterns in patterns.values() for pattern in name_patterns
+        ),
+        flags
+    )
+
+
+def compile_hyperscan(patterns: Dict[str, List[str]]) -> Any:
+    """
+    Compile a table into one case-insensitive Hyperscan database, or return
+    None when Hyperscan is not installed or rejects a pattern.
+    """
+    if hyperscan is None:
+        return None
+
+    expressions = [
+        pattern.encode('utf-8')
+        for name_patterns in patterns.values()
+        for pattern in name_patterns
+    ]
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[flags] * len(expressions)
+        )
+    except hyperscan.error as e:
+        print(f"Hyperscan unavailable, using re: {e}", file=sys.stderr)
+        return None
+    return database
+
+
+def compile_re2(patterns: Dict[str, List[str]]) -> Any:
+    """
+    Compile a table into one case-insensitive RE2 alternation over UTF-8
+    bytes, or return None when RE2 is not installed or rejects a pattern.
+    """
+    if re2 is None:
+        return None
+
+    options = re2.Options()
+    options.case_sensitive = False
+    options.log_errors = False
+    alternation = '|'.join(f'(?:{pattern})' for name_patterns in patterns.values() for pattern in name_patterns)
+    try:
+        return re2.compile(alternation.encode('utf-8'), options)
+    except re2.error as e:
+        message = e.args[0].decode('utf-8', 'replace') if e.args and isinstance(e.args[0], bytes) else e
+        print(f"RE2 unavailable, using re: {message}", file=sys.stderr)
+        return None
+
+
+def compile_gate(patterns: Dict[str, List[str]], engine: str = 're', flags: int = re.IGNORECASE) -> Tuple[str, Any]:
+    """
+    Compile a table into a line gate for one of ENGINES.  Returns the engine
+    actually used with its compiled gate; re is used instead when the requested
+    engine is not installed or cannot compile every pattern (e.g. lookarounds).
+    """
+    if engine == 'hyperscan':
+        if hyperscan is None:
+            print("Hyperscan is not installed, using re", file=sys.stderr)
+        else:
+            database = compile_hyperscan(patterns)
+            if database is not None:
+                return engine, database
+    elif engine == 're2':
+        if re2 is None:
+            print("RE2 is not installed, using re", file=sys.stderr)
+        else:
+            regexp = compile_re2(patterns)
+            if regexp is not None:
+                return engine, regexp
+    return 're', compile_union(patterns, flags)
+
+
+class SeverityPatterns:
+    """
+    A pattern table whose patterns each have a severity level, compiled once.
+    Scans that report only issues at or above a minimum level ask for the
+    patterns and gate of that level, so lower-severity patterns never run.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]], severities: Dict[str, int]) -> None:
+        self.patterns = patterns
+        self.severities = severities
+        self.compiled = compile_patterns(patterns)
+        # Literal patterns are tested as plain text where that is exact
+        self.literals = compile_literals(patterns)
+        # Any pattern, searched in the undecoded file to skip files without matches
+        self.bytes_gate = compile_bytes_union(patterns)
+        self._active: Dict[int, Tuple[Dict[str, List[Pattern[str]]], Dict[str, List[Optional[str]]],
+                                      Pattern[bytes]]] = {}
+        self._gates: Dict[Tuple[str, int], Tuple[str, Any]] = {}
+
+    def active_table(self, min_severity: int) -> Dict[str, List[str]]:
+        """The pattern table restricted to patterns at or above a severity level."""
+        return {
+            name: name_patterns
+            for name, name_patterns in self.patterns.items()
+            if self.severities[name] >= min_severity
+        }
+
+    def active_patterns(
+        self, min_severity: int,
+    ) -> Tuple[Dict[str, List[Pattern[str]]], Dict[str, List[Optional[str]]], Pattern[bytes]]:
+        """
+        Return the compiled patterns and literals at or above a severity level,
+        and the bytes union over just those.
+        """
+        if min_severity <= 1:
+            return self.compiled, self.literals, self.bytes_gate
+        if min_severity not in self._active:
+            table = self.active_table(min_severity)
+            self._active[min_severity] = (
+                {name: self.compiled[name] for name in table},
+                {name: self.literals[name] for name in table},
+                compile_bytes_union(table),
+            )
+        return self._active[min_severity]
+
+    def line_gate(self, engine: str, min_severity: int = 1) -> Tuple[str, Any]:
+        """Compile the patterns at or above a severity level into one line gate for a matching engine."""
+        key = (engine, min_severity)
+        if key not in self._gates:
+            self._gates[key] = compile_gate(self.active_table(min_severity), engine)
+        return self._gates[key]
+
+
+def _rules_out_match(data: Union[bytes, mmap.mmap], gate: Optional[Pattern[bytes]], sentinels: Tuple[bytes, ...]) -> bool:
+    """Check whether plain ASCII data lacks every sentinel, or anything gate matches."""
+    if _NOT_PLAIN_ASCII.search(data) is not None:
+        return False
+    if sentinels:
+        lowered = data[:].lower()
+        if not any(sentinel in lowered for sentinel in sentinels):
+            return True
+    return gate is not None and gate.search(data) is None
+
+
+def _decode(data: Union[bytes, mmap.mmap], gate: Optional[Pattern[bytes]], sentinels: Tuple[bytes, ...]) -> str:
+    """Decode file data like text mode would, or return '' if no match is possible."""
+    if (gate is not None or sentinels) and _rules_out_match(data, gate, sentinels):
+        return ''
+
+    content = data[:].decode('utf-8', errors='ignore')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def read_text(file_path: str, gate: Optional[Pattern[bytes]] = None, sentinels: Tuple[bytes, ...] = ()) -> str:
+    """
+    Read a file as open(file_path, encoding='utf-8', errors='ignore') would.
+
+    The file is memory-mapped and, given a `gate` from compile_bytes_union,
+    searched before anything is decoded: when none of its patterns can match,
+    '' is returned instead.  `sentinels` are lowercase literals at least one
+    of which every match contains; looking for them is far cheaper than
+    running the gate, so a file with none of them is ruled out first.  These
+    shortcuts are only taken for plain ASCII data, where the bytes patterns
+    match exactly what their str forms would.  Binary files, with a NUL
+    among their first BINARY_SNIFF_SIZE bytes, read as '' too.
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and non-regular files cannot be mapped
+            data = f.read()
+            if b'\0' in data[:BINARY_SNIFF_SIZE]:
+                return ''
+            return _decode(data, gate, sentinels)
+        with mapped:
+            if b'\0' in mapped[:BINARY_SNIFF_SIZE]:
+                return ''
+            return _decode(mapped, gate, sentinels)
+
+
+def _raw_blocks(file_path: str) -> Iterator[bytes]:
+    """Yield a file's bytes in BLOCK_SIZE pieces, from a memory map where possible."""
+    with open(file_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and non-regular files cannot be mapped
+            while True:
+                block = f.read(BLOCK_SIZE)
+                if not block:
+                    return
+                yield block
+        with mapped:
+            for start in range(0, len(mapped), BLOCK_SIZE):
+                yield mapped[start:start + BLOCK_SIZE]
+
+
+def _line_blocks(blocks: Iterable[bytes]) -> Iterator[bytes]:
+    """Regroup blocks so that each one but the last ends with a newline."""
+    pending: List[bytes] = []
+    for block in blocks:
+        end = block.rfind(b'\n') + 1
+        if not end:
+            # Still inside a line longer than a block
+            pending.append(block)
+            continue
+        pending.append(block[:end])
+        yield b''.join(pending)
+        pending = [block[end:]]
+    tail = b''.join(pending)
+    if tail:
+        yield tail
+
+
+def scan_file(
+    file_path: str,
+    gate: Tuple[str, Any],
+    bytes_gate: Optional[Pattern[bytes]] = None,
+    sentinels: Tuple[bytes, ...] = (),
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line_number, line) for the lines of a file an (engine, gate) pair
+    from compile_gate matches, as gate_lines(read_text(...), gate) would.
+
+    The file is read in blocks of about BLOCK_SIZE bytes ending at a newline,
+    so only one block is decoded at a time however large the file is.  No
+    line spans two blocks, and a newline byte never falls inside a UTF-8
+    sequence or between the halves of a CRLF, so each block decodes exactly
+    as it would within the whole file.  `bytes_gate` and `sentinels` let a
+    block be skipped undecoded, and binary files yield nothing, as in
+    read_text.
+
+    With the re engine, `bytes_gate` (compile_bytes_union of the same table)
+    also stands in for the gate on plain ASCII blocks, where it matches
+    exactly what the str gate would; only the lines it nominates are decoded.
+    """
+    raw_blocks = _raw_blocks(file_path)
+    first_block = next(raw_blocks, b'')
+    if b'\0' in first_block[:BINARY_SNIFF_SIZE]:
+        return
+
+    ascii_gate = bytes_gate if gate[0] == 're' else None
+    lines_before = 0
+    for block in _line_blocks(itertools.chain((first_block,), raw_blocks)):
+        if ascii_gate is not None and _NOT_PLAIN_ASCII.search(block) is None:
+            if b'\r' in block:
+                # Same newline translation text mode applies
+                block = block.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+            # A block holding none of the sentinels cannot match
+            lowered = block.lower() if sentinels else b''
+            if not sentinels or any(sentinel in lowered for sentinel in sentinels):
+                for line_number, line in _lines_at_positions(block, _line_positions(ascii_gate, block)):
+                    yield lines_before + line_number, line
+            lines_before += block.count(b'\n')
+            continue
+
+        content = _decode(block, bytes_gate, sentinels)
+        for line_number, line in gate_lines(content, gate):
+            yield lines_before + line_number, line
+        if content:
+            lines_before += content.count('\n')
+        else:
+            # Ruled out, so plain ASCII: count LF, CRLF and lone CR line breaks
+            lines_before += block.count(b'\n') + block.count(b'\r') - block.count(b'\r\n')
+
+
+def gated_lines(
+    content: str,
+    gate: Pattern[str],
+    text: Optional[str] = None,
+    line_filter: Optional[Pattern[str]] = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield, in order, (line_number, line) for the lines where `gate` matches.
+
+    `gate` is searched in `text` when given, which must be a same-length view
+    of content (such as its lowercase form).  With `line_filter`, a line is
+    only yielded if that pattern also matches within it.  A gate hit spanning
+    lines only nominates the line it starts on.  Line numbers are found by
+    counting the newlines between consecutive hits, so the file is never
+    split or indexed line by line.
+    """
+    if text is None:
+        text = content
+    line_number = 1
+    counted = 0
+    position = 0
+    while True:
+        match = gate.search(text, position)
+        if match is None:
+            return
+        start = content.rfind('\n', 0, match.start()) + 1
+        end = content.find('\n', match.start())
+        if end == -1:
+            end = len(content)
+        line_number += content.count('\n', counted, start)
+        counted = start
+        if line_filter is None or line_filter.search(content, start, end):
+            yield line_number, content[start:end]
+        if end == len(content):
+            return
+        position = end + 1
+
+
+def _lines_at_positions(data: bytes, positions: Iterable[int]) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line_number, line) once for each line of UTF-8 data holding one of
+    the ascending byte positions; a newline belongs to the line it ends.
+    """
+    line_number = 1
+    counted = 0
+    end = -1
+    for position in positions:
+        if position <= end:
+            continue
+        start = data.rfind(b'\n', 0, position) + 1
+        end = data.find(b'\n', position)
+        if end == -1:
+            end = len(data)
+        line_number += data.count(b'\n', counted, start)
+        counted = start
+        yield line_number, data[start:end].decode('utf-8')
+
+
+def _line_positions(regexp: Any, data: bytes) -> Iterator[int]:
+    """Yield where a compiled pattern first matches on each line it matches on."""
+    position = 0
+    while True:
+        match = regexp.search(data, position)
+        if match is None:
+            return
+        yield match.start()
+        end = data.find(b'\n', match.start())
+        if end == -1:
+            return
+        position = end + 1
+
+
+def hyperscan_lines(database: Any, content: str) -> Iterator[Tuple[int, str]]:
+    """
+    Like gated_lines, for a Hyperscan database from compile_hyperscan.  Lines
+    with bytes its character classes may treat differently are yielded too.
+    """
+    data = content.encode('utf-8')
+    hits = []
+
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+        # Line holding the last byte of the match
+        hits.append(end - 1)
+
+    database.scan(data, match_event_handler=on_match)
+    positions = heapq.merge(sorted(hits), _line_positions(_ENGINE_BLIND_SPOT, data))
+    yield from _lines_at_positions(data, positions)
+
+
+def re2_lines(regexp: Any, content: str) -> Iterator[Tuple[int, str]]:
+    """
+    Like gated_lines, for an RE2 gate from compile_re2.  Lines with bytes its
+    character classes may treat differently are yielded too.
+    """
+    data = content.encode('utf-8')
+    positions = heapq.merge(_line_positions(regexp, data), _line_positions(_ENGINE_BLIND_SPOT, data))
+    yield from _lines_at_positions(data, positions)
+
+
+def gate_lines(content: str, gate: Tuple[str, Any]) -> Iterator[Tuple[int, str]]:
+    """Like gated_lines, for an (engine, gate) pair from compile_gate."""
+    engine, compiled = gate
+    if engine == 'hyperscan':
+        yield from hyperscan_lines(compiled, content)
+    elif engine == 're2':
+        yield from re2_lines(compiled, content)
+    else:
+        yield from gated_lines(content, compiled)
@@ -0,0 +1,93 @@
+"""
+Reporting shared by the scanning hooks: severity levels and their emoji, and
+the JSON output of the --json and --json-lines modes.
+
+orjson is used when it is installed. It writes non-ASCII characters as UTF-8
+rather than \\u escapes, which parses back to the same report.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Optional: orjson serializes reports natively
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Severity names as comparable levels, and the emoji marking each in reports
+SEVERITY_LEVELS = {'low': 1, 'medium': 2, 'high': 3}
+SEVERITY_EMOJI = {'high': '🚨', 'medium': '⚠️', 'low': '💡'}
+
+
+def severity_level(severity: Optional[str]) -> int:
+    """The level of a --severity option; every issue is reported without one."""
+    return SEVERITY_LEVELS.get(severity, 1) if severity else 1
+
+
+def pattern_severities(patterns: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    """Each pattern's severity level, from a name -> pattern info table."""
+    return {
+        pattern_name: SEVERITY_LEVELS.get(pattern_info['severity'], 1)
+        for pattern_name, pattern_info in patterns.items()
+    }
+
+
+def pattern_emoji(patterns: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    """Each pattern's severity emoji, from a name -> pattern info table."""
+    return {
+        pattern_name: SEVERITY_EMOJI.get(pattern_info['severity'], '⚠️')
+        for pattern_name, pattern_info in patterns.items()
+    }
+
+
+def issue_records(issues: Sequence[Tuple[int, str, str, str]]) -> List[Dict[str, Any]]:
+    """Turn (line, content, pattern, description) issues into report records."""
+    return [
+        {
+            'line': line_num,
+            'content': line_content,
+            'pattern': pattern_name,
+            'description': description
+        }
+        for line_num, line_content, pattern_name, description in issues
+    ]
+
+
+def dump_json(data: Any) -> str:
+    """Serialize a report as indented JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2)
+
+
+def dump_json_line(data: Any) -> str:
+    """Serialize one record as a single line of JSON, for --json-lines."""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data)
+
+
+class JsonReport:
+    """
+    The --json or --json-lines report of a scan.  With json_lines each file's
+    records are printed as one line as soon as they are added, so a consumer
+    can act on early files while later ones are still scanned; otherwise
+    finish() prints every file's records as a single document.
+    """
+
+    def __init__(self, json_lines: bool = False) -> None:
+        self.json_lines = json_lines
+        self.results: Dict[str, Any] = {}
+
+    def add(self, file_path: str, records: Any) -> None:
+        """Report one file's records."""
+        if self.json_lines:
+            print(dump_json_line({'file': file_path, 'issues': records}), flush=True)
+        else:
+            self.results[file_path] = records
+
+    def finish(self) -> None:
+        """Print the records collected for --json."""
+        if not self.json_lines:
+            print(dump_json(self.results))
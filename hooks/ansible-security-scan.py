@@ -4,13 +4,30 @@ Ansible-specific security scanning for common vulnerabilities and misconfigurati
 Focuses on security best practices for Ansible playbooks, roles, and configurations.
 """
 
+import os
 import re
 import sys
 import argparse
-import json
+import functools
 import yaml
-from typing import List, Tuple, Dict, Any
-from pathlib import Path
+from typing import Iterator, List, Optional, Pattern, Tuple, Dict, Any
+
+try:
+    from _cache import cached_by_stat, skip_caching
+    from _parallel import map_files
+    from _patterns import BINARY_SNIFF_SIZE, compile_patterns, compile_union, gated_lines
+    from _report import JsonReport, issue_records, pattern_emoji, pattern_severities, severity_level
+except ImportError:  # imported from the installed hooks package
+    from hooks._cache import cached_by_stat, skip_caching
+    from hooks._parallel import map_files
+    from hooks._patterns import BINARY_SNIFF_SIZE, compile_patterns, compile_union, gated_lines
+    from hooks._report import JsonReport, issue_records, pattern_emoji, pattern_severities, severity_level
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 # Ansible-specific security patterns
 ANSIBLE_SECURITY_PATTERNS = {
@@ -131,52 +148,110 @@ ANSIBLE_FILE_PATTERNS = {
     'config': ['ansible.cfg']
 }
 
+# The union is searched over the whole file (MULTILINE, so '$' still means end
+# of line) and only says which lines can match at all; those lines are
+# re-checked pattern by pattern so a line matching several patterns still
+# reports every one of them.  Hyperscan is not used here: it rejects the
+# lookaheads some of these patterns rely on.
+_PATTERN_TABLE = {
+    pattern_name: pattern_info['patterns']
+    for pattern_name, pattern_info in ANSIBLE_SECURITY_PATTERNS.items()
+}
+_COMPILED_PATTERNS = compile_patterns(_PATTERN_TABLE)
+_PATTERN_UNION = compile_union(_PATTERN_TABLE, re.IGNORECASE | re.MULTILINE)
+
+_SEVERITY_INT = pattern_severities(ANSIBLE_SECURITY_PATTERNS)
+_SEVERITY_EMOJI = pattern_emoji(ANSIBLE_SECURITY_PATTERNS)
+
 # YAML keys that indicate Ansible content
 ANSIBLE_INDICATORS = [
     'hosts', 'tasks', 'handlers', 'vars', 'roles', 'plays',
     'become', 'gather_facts', 'connection', 'ansible_'
 ]
 
+# Any indicator, searched for in each lowercased key and value of parsed YAML
+_INDICATOR = re.compile('|'.join(re.escape(indicator) for indicator in ANSIBLE_INDICATORS))
 
+# File names and path components that mark Ansible files
+ANSIBLE_FILE_EXTENSIONS = frozenset({'.yml', '.yaml'})
+ANSIBLE_FILE_NAMES = frozenset({'ansible.cfg', 'hosts', 'inventory', 'site.yml', 'site.yaml'})
+ANSIBLE_DIRECTORIES = frozenset({'group_vars', 'host_vars', 'roles', 'playbooks', 'inventories'})
+
+
+@functools.lru_cache(maxsize=8192)
 def is_ansible_file(file_path: str) -> bool:
     """Determine if file is an Ansible-related file."""
-    path = Path(file_path)
+    name = os.path.basename(file_path).lower()
     
     # Check file extensions
-    if path.suffix.lower() in ['.yml', '.yaml']:
+    if os.path.splitext(name)[1] in ANSIBLE_FILE_EXTENSIONS:
         return True
     
     # Check specific filenames
-    if path.name.lower() in ['ansible.cfg', 'hosts', 'inventory', 'site.yml', 'site.yaml']:
+    if name in ANSIBLE_FILE_NAMES:
         return True
     
     # Check if in Ansible directories
-    path_parts = [p.lower() for p in path.parts]
-    ansible_dirs = ['group_vars', 'host_vars', 'roles', 'playbooks', 'inventories']
-    if any(ansible_dir in path_parts for ansible_dir in ansible_dirs):
-        return True
+    # (Windows accepts both separators)
+    parts = file_path.lower().replace(os.altsep or os.sep, os.sep).split(os.sep)
+    return not ANSIBLE_DIRECTORIES.isdisjoint(parts)
+
+
+def analyze_yaml_content(data: Any) -> bool:
+    """Check if parsed YAML data appears to be Ansible-related."""
+    # Search each key and scalar for the indicators, as searching str(data)
+    # did, instead of building that string.  Aliases can make the tree
+    # recursive, so each container is visited once
+    stack = [data]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (dict, list)):
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            if isinstance(node, dict):
+                stack.extend(node.keys())
+                stack.extend(node.values())
+            else:
+                stack.extend(node)
+        elif _INDICATOR.search(str(node).lower()):
+            return True
     
     return False
 
 
-def analyze_yaml_content(content: str) -> bool:
-    """Check if YAML content appears to be Ansible-related."""
-    try:
-        # Try to parse as YAML
-        data = yaml.safe_load(content)
-        if not data:
-            return False
-        
-        # Convert to string for pattern matching
-        content_str = str(data).lower()
-        
-        # Check for Ansible indicators
-        return any(indicator in content_str for indicator in ANSIBLE_INDICATORS)
-    
-    except yaml.YAMLError:
-        # If it's not valid YAML, check content as text
-        content_lower = content.lower()
-        return any(indicator in content_lower for indicator in ANSIBLE_INDICATORS)
+def analyze_text_content(content: str) -> bool:
+    """Check if raw (unparseable) content appears to be Ansible-related."""
+    content_lower = content.lower()
+    return any(indicator in content_lower for indicator in ANSIBLE_INDICATORS)
+
+
+@functools.lru_cache(maxsize=None)
+def active_patterns(min_severity: int) -> Tuple[List[Tuple[str, List[Pattern[str]]]], Optional[Pattern[str]]]:
+    """
+    Return the (name, compiled patterns) pairs at or above a severity level
+    and the union gate over just those, or None if no pattern qualifies.
+    """
+    table = {
+        pattern_name: patterns
+        for pattern_name, patterns in _PATTERN_TABLE.items()
+        if _SEVERITY_INT[pattern_name] >= min_severity
+    }
+    if not table:
+        return [], None
+    if len(table) == len(_PATTERN_TABLE):
+        return list(_COMPILED_PATTERNS.items()), _PATTERN_UNION
+    compiled = [(pattern_name, _COMPILED_PATTERNS[pattern_name]) for pattern_name in table]
+    return compiled, compile_union(table, re.IGNORECASE | re.MULTILINE)
+
+
+def candidate_lines(content: str, union: Pattern[str] = _PATTERN_UNION) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line_number, line) for lines some security pattern may match.
+    Only these lines are sliced out of the content; the file is never split.
+    """
+    yield from gated_lines(content, union)
 
 
 def check_vault_encryption(file_path: str, content: str) -> List[Tuple[int, str, str, str]]:
@@ -186,7 +261,8 @@ def check_vault_encryption(file_path: str, content: str) -> List[Tuple[int, str,
     # Files that commonly contain secrets
     sensitive_files = ['vault', 'secret', 'password', 'credential', 'key']
     
-    if any(sensitive in Path(file_path).name.lower() for sensitive in sensitive_files):
+    file_name = os.path.basename(file_path).lower()
+    if any(sensitive in file_name for sensitive in sensitive_files):
         if not content.startswith('$ANSIBLE_VAULT'):
             issues.append((
                 1,
@@ -198,54 +274,72 @@ def check_vault_encryption(file_path: str, content: str) -> List[Tuple[int, str,
     return issues
 
 
-def check_ansible_security(file_path: str) -> List[Tuple[int, str, str, str]]:
-    """Check for Ansible-specific security patterns."""
+@cached_by_stat('ansible-security-scan', decode=lambda issues: [tuple(issue) for issue in issues])
+def check_ansible_security(file_path: str, min_severity: int = 1) -> List[Tuple[int, str, str, str]]:
+    """
+    Check for Ansible-specific security patterns.  Patterns below min_severity
+    are not run; issues from the vault and YAML structure checks always are.
+    """
     issues = []
     
     if not is_ansible_file(file_path):
         return issues
     
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            lines = content.split('\n')
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        
+        # Skip binary files before paying for UTF-8 decoding
+        if b'\0' in raw[:BINARY_SNIFF_SIZE]:
+            return issues
         
-        # Skip if not actually Ansible content (for .yml/.yaml files)
+        content = raw.decode('utf-8', errors='ignore')
+        if '\r' in content:
+            # Same newline translation text-mode reads apply
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        # Parse YAML once; the result feeds both the Ansible check and the
+        # structural analysis below
+        data = None
         if file_path.endswith(('.yml', '.yaml')):
-            if not analyze_yaml_content(content):
+            try:
+                data = yaml.load(content, Loader=_YamlLoader)
+                is_ansible = analyze_yaml_content(data)
+            except yaml.YAMLError:
+                # If it's not valid YAML, check content as text
+                is_ansible = analyze_text_content(content)
+            
+            # Skip if not actually Ansible content
+            if not is_ansible:
                 return issues
         
         # Check for vault encryption
         issues.extend(check_vault_encryption(file_path, content))
         
         # Pattern-based analysis
-        for line_num, line in enumerate(lines, 1):
+        patterns, union = active_patterns(min_severity)
+        for line_num, line in candidate_lines(content, union) if union else ():
             if not line.strip() or line.strip().startswith('#'):
                 continue
             
             # Check security patterns
-            for pattern_name, pattern_info in ANSIBLE_SECURITY_PATTERNS.items():
-                for pattern in pattern_info['patterns']:
-                    if re.search(pattern, line, re.IGNORECASE):
+            for pattern_name, compiled_patterns in patterns:
+                for pattern in compiled_patterns:
+                    if pattern.search(line):
                         issues.append((
                             line_num,
                             line.strip(),
                             pattern_name,
-                            pattern_info['description']
+                            ANSIBLE_SECURITY_PATTERNS[pattern_name]['description']
                         ))
         
         # Additional YAML-specific checks
-        if file_path.endswith(('.yml', '.yaml')):
-            try:
-                data = yaml.safe_load(content)
-                if data:
-                    yaml_issues = analyze_yaml_structure(data, file_path)
-                    issues.extend(yaml_issues)
-            except yaml.YAMLError:
-                pass
+        if data:
+            issues.extend(analyze_yaml_structure(data, file_path))
     
     except Exception as e:
         print(f"Error analyzing {file_path}: {e}", file=sys.stderr)
+        skip_caching()
     
     return issues
 
@@ -277,16 +371,7 @@ def analyze_yaml_structure(data: Any, file_path: str) -> List[Tuple[int, str, st
 
 def get_severity_emoji(pattern_name: str) -> str:
     """Get emoji based on severity."""
-    if pattern_name in ANSIBLE_SECURITY_PATTERNS:
-        severity = ANSIBLE_SECURITY_PATTERNS[pattern_name]['severity']
-    else:
-        severity = 'medium'
-    
-    return {
-        'high': '🚨',
-        'medium': '⚠️',
-        'low': '💡'
-    }.get(severity, '⚠️')
+    return _SEVERITY_EMOJI.get(pattern_name, '⚠️')
 
 
 def main():
@@ -294,43 +379,26 @@ def main():
     parser.add_argument('files', nargs='*', help='Files to check')
     parser.add_argument('--severity', choices=['low', 'medium', 'high'],
                         help='Minimum severity level to report')
-    parser.add_argument('--json', action='store_true',
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--json', action='store_true',
                         help='Output results in JSON format')
+    output.add_argument('--json-lines', action='store_true',
+                        help='Output one JSON object per file with issues, as each file is scanned')
     args = parser.parse_args()
     
     exit_code = 0
     total_issues = 0
-    all_results = {}
+    report = JsonReport(args.json_lines) if args.json or args.json_lines else None
     
-    severity_levels = {'low': 1, 'medium': 2, 'high': 3}
-    min_severity = severity_levels.get(args.severity, 1) if args.severity else 1
+    min_severity = severity_level(args.severity)
     
-    for file_path in args.files:
-        issues = check_ansible_security(file_path)
-        
-        # Filter by severity if specified
-        if args.severity:
-            filtered_issues = []
-            for line_num, line_content, pattern_name, description in issues:
-                if pattern_name in ANSIBLE_SECURITY_PATTERNS:
-                    pattern_severity = ANSIBLE_SECURITY_PATTERNS[pattern_name]['severity']
-                    if severity_levels.get(pattern_severity, 1) >= min_severity:
-                        filtered_issues.append((line_num, line_content, pattern_name, description))
-                else:
-                    filtered_issues.append((line_num, line_content, pattern_name, description))
-            issues = filtered_issues
-        
+    # Patterns below the minimum severity are skipped inside the scan
+    results = map_files(check_ansible_security, args.files, (min_severity,))
+    
+    for file_path, issues in zip(args.files, results):
         if issues:
-            if args.json:
-                all_results[file_path] = [
-                    {
-                        'line': line_num,
-                        'content': line_content,
-                        'pattern': pattern_name,
-                        'description': description
-                    }
-                    for line_num, line_content, pattern_name, description in issues
-                ]
+            if report is not None:
+                report.add(file_path, issue_records(issues))
             else:
                 print(f"\n📋 Ansible security issues found in {file_path}:")
                 for line_num, line_content, pattern_name, description in issues:
@@ -343,8 +411,8 @@ def main():
             total_issues += len(issues)
             exit_code = 1
     
-    if args.json:
-        print(json.dumps(all_results, indent=2))
+    if report is not None:
+        report.finish()
     elif total_issues > 0:
         print(f"\n❌ Found {total_issues} potential Ansible security issue(s)")
         print("💡 Review Ansible playbooks and configurations for security vulnerabilities")
@@ -3,11 +3,19 @@
 Check for license headers in source code files.
 """
 
+import os
 import sys
 import argparse
+import functools
 import re
 from typing import List, Set, Dict
-from pathlib import Path
+
+try:
+    from _compiled import compiled_main
+    from _parallel import map_files
+except ImportError:  # imported from the installed hooks package
+    from hooks._compiled import compiled_main
+    from hooks._parallel import map_files
 
 # Common license header patterns
 LICENSE_PATTERNS = {
@@ -34,71 +42,84 @@ LICENSE_PATTERNS = {
     ]
 }
 
+# One alternation per license type, compiled once at import
+_LICENSE_COMPILED = {
+    license_type: re.compile(
+        '|'.join(f'(?:{pattern})' for pattern in patterns),
+        re.IGNORECASE | re.MULTILINE
+    )
+    for license_type, patterns in LICENSE_PATTERNS.items()
+}
+
+# Characters read from the top of a file; plenty for any license header
+HEAD_SIZE = 4096
+
 # File extensions that should have license headers
-HEADER_REQUIRED_EXTENSIONS = {
+HEADER_REQUIRED_EXTENSIONS = frozenset({
     '.py', '.java', '.js', '.ts', '.cpp', '.c', '.h', '.hpp', 
     '.cs', '.go', '.rs', '.php', '.rb', '.scala', '.swift'
-}
+})
 
 # File extensions to skip
-SKIP_EXTENSIONS = {
+SKIP_EXTENSIONS = frozenset({
     '.md', '.txt', '.json', '.xml', '.yaml', '.yml', '.toml',
     '.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg', '.pdf'
-}
+})
 
 # Directories to skip
-SKIP_DIRECTORIES = {
+SKIP_DIRECTORIES = frozenset({
     'node_modules', '.git', 'vendor', 'build', 'dist', 'target',
     '.pytest_cache', '__pycache__', '.venv', 'venv'
-}
+})
 
 
+@functools.lru_cache(maxsize=8192)
 def should_check_file(file_path: str) -> bool:
     """Determine if file should be checked for license headers."""
-    path = Path(file_path)
+    # Skip if in excluded directory (Windows accepts both separators)
+    parts = file_path.replace(os.altsep or os.sep, os.sep).split(os.sep)
+    if not SKIP_DIRECTORIES.isdisjoint(parts):
+        return False
     
-    # Skip if in excluded directory
-    for part in path.parts:
-        if part in SKIP_DIRECTORIES:
-            return False
+    suffix = os.path.splitext(file_path)[1]
     
     # Skip if excluded extension
-    if path.suffix in SKIP_EXTENSIONS:
+    if suffix in SKIP_EXTENSIONS:
         return False
     
     # Only check files that require headers
-    return path.suffix in HEADER_REQUIRED_EXTENSIONS
+    return suffix in HEADER_REQUIRED_EXTENSIONS
 
 
 def read_file_head(file_path: str, lines: int = 20) -> str:
-    """Read the first N lines of a file."""
+    """Read the first N lines of a file, bounded to HEAD_SIZE characters."""
     try:
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            head_lines = []
-            for i, line in enumerate(f):
-                if i >= lines:
-                    break
-                head_lines.append(line)
-            return ''.join(head_lines)
+            head = f.read(HEAD_SIZE)
     except Exception:
         return ""
 
+    end = -1
+    for _ in range(lines):
+        end = head.find('\n', end + 1)
+        if end == -1:
+            return head
+    return head[:end + 1]
+
 
 def has_license_header(file_path: str) -> tuple[bool, List[str]]:
     """Check if file has a license header."""
     head_content = read_file_head(file_path)
     found_licenses = []
     
-    for license_type, patterns in LICENSE_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, head_content, re.IGNORECASE | re.MULTILINE):
-                found_licenses.append(license_type)
-                break
+    for license_type, pattern in _LICENSE_COMPILED.items():
+        if pattern.search(head_content):
+            found_licenses.append(license_type)
     
     return len(found_licenses) > 0, found_licenses
 
 
-def main():
+def main() -> int:
     parser = argparse.ArgumentParser(description='Check for license headers in source files')
     parser.add_argument('files', nargs='*', help='Files to check')
     parser.add_argument('--require-license', action='store_true',
@@ -112,12 +133,11 @@ def main():
     files_with_license = 0
     files_without_license = []
     
-    for file_path in args.files:
-        if not should_check_file(file_path):
-            continue
-        
+    files_to_check = [file_path for file_path in args.files if should_check_file(file_path)]
+    results = map_files(has_license_header, files_to_check)
+    
+    for file_path, (has_license, found_licenses) in zip(files_to_check, results):
         checked_files += 1
-        has_license, found_licenses = has_license_header(file_path)
         
         if has_license:
             files_with_license += 1
@@ -155,4 +175,4 @@ def main():
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit((compiled_main('check_license') or main)())
@@ -8,12 +8,39 @@ import argparse
 import xml.etree.ElementTree as ET
 from xml.parsers.expat import ExpatError
 
+try:
+    from _parallel import map_files
+except ImportError:  # imported from the installed hooks package
+    from hooks._parallel import map_files
+
+# Optional: lxml streams the file through libxml2
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+_LXML_ERRORS = (etree.XMLSyntaxError,) if etree is not None else ()
+
+
+def iterparse(file_path):
+    """Stream parse events for a file, preferring lxml over the stdlib parser."""
+    if etree is not None:
+        # Never expand entities or touch the network while validating.
+        # huge_tree lifts libxml2's depth and text size limits, which the
+        # stdlib parser does not have, so deep or large valid files still pass
+        return etree.iterparse(file_path, events=('end',), resolve_entities=False, no_network=True,
+                               huge_tree=True)
+    return ET.iterparse(file_path, events=('end',))
+
 
 def validate_xml_file(file_path):
-    """Validate XML file syntax."""
+    """Validate XML file syntax without building the whole document tree."""
     try:
-        ET.parse(file_path)
+        for _, element in iterparse(file_path):
+            element.clear()
         return True, None
+    except _LXML_ERRORS as e:
+        return False, f"XML Syntax Error: {e}"
     except ET.ParseError as e:
         return False, f"XML Parse Error: {e}"
     except ExpatError as e:
@@ -29,18 +56,13 @@ def main():
     
     exit_code = 0
     
-    for file_path in args.files:
-        try:
-            is_valid, error_msg = validate_xml_file(file_path)
-            
-            if is_valid:
-                print(f"✅ {file_path}: Valid XML")
-            else:
-                print(f"❌ {file_path}: {error_msg}")
-                exit_code = 1
-                
-        except FileNotFoundError:
-            print(f"❌ {file_path}: File not found")
+    results = map_files(validate_xml_file, args.files)
+    
+    for file_path, (is_valid, error_msg) in zip(args.files, results):
+        if is_valid:
+            print(f"✅ {file_path}: Valid XML")
+        else:
+            print(f"❌ {file_path}: {error_msg}")
             exit_code = 1
     
     return exit_code
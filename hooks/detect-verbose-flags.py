@@ -4,13 +4,21 @@ Detect verbose flags and debug logging that should not be committed to productio
 Specifically designed to catch verbose flags that GenAI tools might include.
 """
 
-import re
 import sys
 import argparse
-import json
+import functools
 from typing import List, Tuple, Dict, Set
 from pathlib import Path
 
+try:
+    from _parallel import map_files
+    from _patterns import ENGINES, SeverityPatterns, matching_patterns, scan_file
+    from _report import JsonReport, issue_records, pattern_emoji, pattern_severities, severity_level
+except ImportError:  # imported from the installed hooks package
+    from hooks._parallel import map_files
+    from hooks._patterns import ENGINES, SeverityPatterns, matching_patterns, scan_file
+    from hooks._report import JsonReport, issue_records, pattern_emoji, pattern_severities, severity_level
+
 # Verbose flag patterns by language/framework
 VERBOSE_PATTERNS = {
     'debug_flags': {
@@ -195,21 +203,31 @@ DEBUG_CONFIG_FILES = {
     'application.properties', 'application.yml', 'logback.xml', 'log4j.xml'
 }
 
-# Safe contexts where verbose flags might be acceptable
-SAFE_CONTEXTS = [
-    r'test.*', r'.*test.*', r'spec.*', r'.*spec.*', r'mock.*', r'.*mock.*',
-    r'example.*', r'.*example.*', r'sample.*', r'.*sample.*', r'demo.*',
-    r'debug.*', r'.*debug.*', r'dev.*', r'.*dev.*', r'development.*',
-    r'local.*', r'.*local.*'
-]
+# Path substrings marking contexts where verbose flags might be acceptable
+SAFE_CONTEXT_KEYWORDS = ('test', 'spec', 'mock', 'example', 'sample', 'debug', 'dev', 'local')
+# Only safe at the start of the path
+SAFE_CONTEXT_PREFIXES = ('demo',)
+
+_SEVERITY_INT = pattern_severities(VERBOSE_PATTERNS)
+_SEVERITY_EMOJI = pattern_emoji(VERBOSE_PATTERNS)
 
+_PATTERN_TABLE = {
+    pattern_name: pattern_info['patterns']
+    for pattern_name, pattern_info in VERBOSE_PATTERNS.items()
+}
+_PATTERNS = SeverityPatterns(_PATTERN_TABLE, _SEVERITY_INT)
+active_patterns = _PATTERNS.active_patterns
+line_gate = _PATTERNS.line_gate
 
+
+@functools.lru_cache(maxsize=8192)
 def is_safe_context(file_path: str) -> bool:
     """Check if file is in a safe context where debug flags might be acceptable."""
     path_lower = file_path.lower()
-    return any(re.match(pattern, path_lower) for pattern in SAFE_CONTEXTS)
+    return path_lower.startswith(SAFE_CONTEXT_PREFIXES) or any(keyword in path_lower for keyword in SAFE_CONTEXT_KEYWORDS)
 
 
+@functools.lru_cache(maxsize=8192)
 def should_check_file(file_path: str) -> bool:
     """Determine if file should be checked for verbose flags."""
     path = Path(file_path)
@@ -225,8 +243,11 @@ def should_check_file(file_path: str) -> bool:
     return False
 
 
-def check_verbose_flags(file_path: str) -> List[Tuple[int, str, str, str]]:
-    """Check for verbose flags and debug logging in a file."""
+def check_verbose_flags(file_path: str, engine: str = 're', min_severity: int = 1) -> List[Tuple[int, str, str, str]]:
+    """
+    Check for verbose flags and debug logging in a file.  Patterns below
+    min_severity are not run.
+    """
     issues = []
     
     if not should_check_file(file_path):
@@ -234,31 +255,28 @@ def check_verbose_flags(file_path: str) -> List[Tuple[int, str, str, str]]:
     
     # Be more lenient with files in safe contexts
     in_safe_context = is_safe_context(file_path)
+    compiled, literals, bytes_gate = active_patterns(min_severity)
     
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            lines = content.split('\n')
-        
-        for line_num, line in enumerate(lines, 1):
+        # Only lines the combined patterns match are checked pattern by pattern
+        for line_num, line in scan_file(file_path, line_gate(engine, min_severity), bytes_gate):
             stripped_line = line.strip()
             if not stripped_line or stripped_line.startswith('#'):
                 continue
             
             # Check each pattern type
-            for pattern_name, pattern_info in VERBOSE_PATTERNS.items():
-                for pattern in pattern_info['patterns']:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        # In safe contexts, only flag high severity issues
-                        if in_safe_context and pattern_info['severity'] == 'low':
-                            continue
-                        
-                        issues.append((
-                            line_num,
-                            stripped_line,
-                            pattern_name,
-                            pattern_info['description']
-                        ))
+            for pattern_name in matching_patterns(line, compiled, literals):
+                pattern_info = VERBOSE_PATTERNS[pattern_name]
+                # In safe contexts, only flag high severity issues
+                if in_safe_context and pattern_info['severity'] == 'low':
+                    continue
+                
+                issues.append((
+                    line_num,
+                    stripped_line,
+                    pattern_name,
+                    pattern_info['description']
+                ))
     
     except Exception as e:
         print(f"Error analyzing {file_path}: {e}", file=sys.stderr)
@@ -268,16 +286,18 @@ def check_verbose_flags(file_path: str) -> List[Tuple[int, str, str, str]]:
 
 def get_severity_emoji(pattern_name: str) -> str:
     """Get emoji based on severity."""
-    if pattern_name in VERBOSE_PATTERNS:
-        severity = VERBOSE_PATTERNS[pattern_name]['severity']
-    else:
-        severity = 'medium'
-    
-    return {
-        'high': '🚨',
-        'medium': '⚠️',
-        'low': '💡'
-    }.get(severity, '⚠️')
+    return _SEVERITY_EMOJI.get(pattern_name, '⚠️')
+
+
+def print_issues(file_path: str, issues: List[Tuple[int, str, str, str]]) -> None:
+    """Print one file's verbose flags."""
+    print(f"\n🔍 Verbose flags detected in {file_path}:")
+    for line_num, line_content, pattern_name, description in issues:
+        emoji = get_severity_emoji(pattern_name)
+        print(f"  {emoji} Line {line_num}: {pattern_name.replace('_', ' ').title()}")
+        print(f"    Description: {description}")
+        if line_content:
+            print(f"    Code: {line_content}")
 
 
 def main():
@@ -285,63 +305,48 @@ def main():
     parser.add_argument('files', nargs='*', help='Files to check')
     parser.add_argument('--severity', choices=['low', 'medium', 'high'],
                         help='Minimum severity level to report')
-    parser.add_argument('--json', action='store_true',
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--json', action='store_true',
                         help='Output results in JSON format')
+    output.add_argument('--json-lines', action='store_true',
+                        help='Output one JSON object per file with issues, as each file is scanned')
     parser.add_argument('--exclude-safe-contexts', action='store_true',
                         help='Exclude files in safe contexts (test, dev, example directories)')
+    parser.add_argument('--engine', choices=ENGINES, default='re',
+                        help='Regex engine used to find candidate lines (default: re)')
     args = parser.parse_args()
     
     exit_code = 0
     total_issues = 0
-    all_results = {}
+    report = JsonReport(args.json_lines) if args.json or args.json_lines else None
+    
+    min_severity = severity_level(args.severity)
+    
+    # Skip safe contexts if requested
+    files = [
+        file_path for file_path in args.files
+        if not (args.exclude_safe_contexts and is_safe_context(file_path))
+    ]
     
-    severity_levels = {'low': 1, 'medium': 2, 'high': 3}
-    min_severity = severity_levels.get(args.severity, 1) if args.severity else 1
+    # Compiled before the pool starts, so forked workers inherit the gate
+    # (spawned workers compile their own on first use); patterns below the
+    # minimum severity are skipped inside the scan
+    active_patterns(min_severity)
+    line_gate(args.engine, min_severity)
+    results = map_files(check_verbose_flags, files, (args.engine, min_severity))
     
-    for file_path in args.files:
-        # Skip safe contexts if requested
-        if args.exclude_safe_contexts and is_safe_context(file_path):
-            continue
-        
-        issues = check_verbose_flags(file_path)
-        
-        # Filter by severity if specified
-        if args.severity:
-            filtered_issues = []
-            for line_num, line_content, pattern_name, description in issues:
-                if pattern_name in VERBOSE_PATTERNS:
-                    pattern_severity = VERBOSE_PATTERNS[pattern_name]['severity']
-                    if severity_levels.get(pattern_severity, 1) >= min_severity:
-                        filtered_issues.append((line_num, line_content, pattern_name, description))
-                else:
-                    filtered_issues.append((line_num, line_content, pattern_name, description))
-            issues = filtered_issues
-        
+    for file_path, issues in zip(files, results):
         if issues:
-            if args.json:
-                all_results[file_path] = [
-                    {
-                        'line': line_num,
-                        'content': line_content,
-                        'pattern': pattern_name,
-                        'description': description
-                    }
-                    for line_num, line_content, pattern_name, description in issues
-                ]
+            if report is not None:
+                report.add(file_path, issue_records(issues))
             else:
-                print(f"\n🔍 Verbose flags detected in {file_path}:")
-                for line_num, line_content, pattern_name, description in issues:
-                    emoji = get_severity_emoji(pattern_name)
-                    print(f"  {emoji} Line {line_num}: {pattern_name.replace('_', ' ').title()}")
-                    print(f"    Description: {description}")
-                    if line_content:
-                        print(f"    Code: {line_content}")
+                print_issues(file_path, issues)
             
             total_issues += len(issues)
             exit_code = 1
     
-    if args.json:
-        print(json.dumps(all_results, indent=2))
+    if report is not None:
+        report.finish()
     elif total_issues > 0:
         print(f"\n❌ Found {total_issues} verbose flag(s) or debug configuration(s)")
         print("💡 Remove debug/verbose flags before production deployment")
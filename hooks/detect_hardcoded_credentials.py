@@ -4,52 +4,68 @@ Detect hardcoded credentials and sensitive information in code files.
 Enhanced for GenAI-generated code which might accidentally include credentials.
 """
 
+import os
 import re
 import sys
 import argparse
-from typing import List, Tuple, Dict, Set
-import base64
+from typing import Iterator, List, Tuple, Dict, Set
 
-# Patterns for common credential types
+try:
+    from _cache import cached_by_stat, skip_caching
+    from _compiled import compiled_main
+    from _parallel import map_files
+    from _patterns import (BINARY_SNIFF_SIZE, compile_hyperscan, compile_patterns, compile_union, gated_lines,
+                           hyperscan_lines)
+except ImportError:  # imported from the installed hooks package
+    from hooks._cache import cached_by_stat, skip_caching
+    from hooks._compiled import compiled_main
+    from hooks._parallel import map_files
+    from hooks._patterns import (BINARY_SNIFF_SIZE, compile_hyperscan, compile_patterns, compile_union, gated_lines,
+                                 hyperscan_lines)
+
+# Patterns for common credential types; group 1 captures the credential value
 CREDENTIAL_PATTERNS = {
     'password': [
-        r'password\s*[:=]\s*["\'][^"\']{3,}["\']',
-        r'pwd\s*[:=]\s*["\'][^"\']{3,}["\']',
-        r'passwd\s*[:=]\s*["\'][^"\']{3,}["\']',
-        r'secret\s*[:=]\s*["\'][^"\']{8,}["\']',
+        r'password\s*[:=]\s*["\']([^"\']{3,})["\']',
+        r'pwd\s*[:=]\s*["\']([^"\']{3,})["\']',
+        r'passwd\s*[:=]\s*["\']([^"\']{3,})["\']',
+        r'secret\s*[:=]\s*["\']([^"\']{8,})["\']',
     ],
     'api_key': [
-        r'api[_-]?key\s*[:=]\s*["\'][^"\']{10,}["\']',
-        r'apikey\s*[:=]\s*["\'][^"\']{10,}["\']',
-        r'key\s*[:=]\s*["\'][A-Za-z0-9]{20,}["\']',
+        r'api[_-]?key\s*[:=]\s*["\']([^"\']{10,})["\']',
+        r'apikey\s*[:=]\s*["\']([^"\']{10,})["\']',
+        r'key\s*[:=]\s*["\']([A-Za-z0-9]{20,})["\']',
     ],
     'token': [
-        r'token\s*[:=]\s*["\'][^"\']{10,}["\']',
-        r'auth[_-]?token\s*[:=]\s*["\'][^"\']{10,}["\']',
-        r'access[_-]?token\s*[:=]\s*["\'][^"\']{10,}["\']',
-        r'bearer\s*[:=]\s*["\'][^"\']{10,}["\']',
+        r'token\s*[:=]\s*["\']([^"\']{10,})["\']',
+        r'auth[_-]?token\s*[:=]\s*["\']([^"\']{10,})["\']',
+        r'access[_-]?token\s*[:=]\s*["\']([^"\']{10,})["\']',
+        r'bearer\s*[:=]\s*["\']([^"\']{10,})["\']',
     ],
     'database': [
-        r'db[_-]?password\s*[:=]\s*["\'][^"\']{3,}["\']',
-        r'database[_-]?password\s*[:=]\s*["\'][^"\']{3,}["\']',
-        r'connection[_-]?string\s*[:=]\s*["\'][^"\']*password[^"\']*["\']',
+        r'db[_-]?password\s*[:=]\s*["\']([^"\']{3,})["\']',
+        r'database[_-]?password\s*[:=]\s*["\']([^"\']{3,})["\']',
+        r'connection[_-]?string\s*[:=]\s*["\']([^"\']*password[^"\']*)["\']',
     ],
     'private_key': [
-        r'private[_-]?key\s*[:=]\s*["\'][^"\']{20,}["\']',
+        r'private[_-]?key\s*[:=]\s*["\']([^"\']{20,})["\']',
         r'-----BEGIN\s+(?:RSA\s+)?PRIVATE\s+KEY-----',
         r'-----BEGIN\s+OPENSSH\s+PRIVATE\s+KEY-----',
     ],
     'aws': [
-        r'aws[_-]?secret[_-]?access[_-]?key\s*[:=]\s*["\'][^"\']{20,}["\']',
-        r'aws[_-]?access[_-]?key[_-]?id\s*[:=]\s*["\']AKIA[0-9A-Z]{16}["\']',
+        r'aws[_-]?secret[_-]?access[_-]?key\s*[:=]\s*["\']([^"\']{20,})["\']',
+        r'aws[_-]?access[_-]?key[_-]?id\s*[:=]\s*["\'](AKIA[0-9A-Z]{16})["\']',
     ],
     'generic_secret': [
-        r'secret[_-]?key\s*[:=]\s*["\'][^"\']{10,}["\']',
-        r'client[_-]?secret\s*[:=]\s*["\'][^"\']{10,}["\']',
-        r'app[_-]?secret\s*[:=]\s*["\'][^"\']{10,}["\']',
+        r'secret[_-]?key\s*[:=]\s*["\']([^"\']{10,})["\']',
+        r'client[_-]?secret\s*[:=]\s*["\']([^"\']{10,})["\']',
+        r'app[_-]?secret\s*[:=]\s*["\']([^"\']{10,})["\']',
     ]
 }
 
+# Every credential pattern contains one of these (lowercase) literals
+CREDENTIAL_KEYWORDS = ['passw', 'pwd', 'secret', 'key', 'token', 'bearer', '-----begin']
+
 # Common safe values that can be ignored
 SAFE_VALUES = {
     'password', 'secret', 'key', 'token', 'your_password_here', 'change_me',
@@ -59,8 +75,17 @@ SAFE_VALUES = {
     '12345', '123456', 'qwerty', 'admin', 'root', 'user'
 }
 
-# File extensions to skip
-SKIP_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg', '.pdf', '.zip', '.tar', '.gz'}
+# Substrings that mark a value as placeholder text
+PLACEHOLDER_INDICATORS = ['your_', 'insert_', 'replace_', 'change_', 'enter_', 'add_', 'put_']
+
+# Substrings that mark a file path as test/example code
+SAFE_PATH_INDICATORS = ['test', 'spec', 'mock', 'example', 'sample', 'demo']
+
+# File extensions to skip, in lowercase; file names are matched case-insensitively
+SKIP_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg', '.pdf', '.zip', '.tar', '.gz'})
+
+# Files larger than this (bundles, data dumps) are skipped without being read
+MAX_FILE_SIZE = 2 * 1024 * 1024
 
 # Patterns that suggest this might be in a comment or test
 SAFE_CONTEXT_PATTERNS = [
@@ -81,16 +106,42 @@ SAFE_CONTEXT_PATTERNS = [
     r'.*placeholder.*',
 ]
 
+# Lines the union (or Hyperscan) hits are re-checked pattern by pattern so
+# every credential type on a line is reported
+_COMPILED_PATTERNS = compile_patterns(CREDENTIAL_PATTERNS)
+_PATTERN_UNION = compile_union(CREDENTIAL_PATTERNS)
+_HYPERSCAN_DB = compile_hyperscan(CREDENTIAL_PATTERNS)
+
+# The safe-context patterns are all tried at the start of the line, so they
+# combine into a single anchored alternation
+_SAFE_CONTEXT = re.compile('|'.join(f'(?:{pattern})' for pattern in SAFE_CONTEXT_PATTERNS))
+
+# Each indicator list as one literal alternation: a single search per check
+_PLACEHOLDER_RE = re.compile('|'.join(re.escape(indicator) for indicator in PLACEHOLDER_INDICATORS))
+_SAFE_PATH_RE = re.compile('|'.join(re.escape(indicator) for indicator in SAFE_PATH_INDICATORS))
 
-def is_safe_context(line: str, file_path: str) -> bool:
-    """Check if the line/file appears to be in a safe context."""
+# Prefilter: the keywords are searched in lowercased ASCII content, which is far
+# cheaper than the union; other content keeps re's full case folding
+_KEYWORDS = re.compile('|'.join(re.escape(keyword) for keyword in CREDENTIAL_KEYWORDS))
+_KEYWORDS_IGNORECASE = re.compile(_KEYWORDS.pattern, re.IGNORECASE)
+_KEYWORDS_BYTES = re.compile(_KEYWORDS.pattern.encode('ascii'))
+
+# Padded base64 alphabet, checked structurally instead of decoding
+_BASE64 = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+
+# Value extraction for patterns without a capture group
+_QUOTED_VALUE = re.compile(r'["\']([^"\']+)["\']')
+_BARE_VALUE = re.compile(r'[:=]\s*([^\s\'"]+)')
+
+
+def is_safe_context(line_lower: str, file_path: str) -> bool:
+    """Check if the (already lowercased) line/file appears to be in a safe context."""
     # Check if file is a test file
-    if any(test_indicator in file_path.lower() for test_indicator in 
-           ['test', 'spec', 'mock', 'example', 'sample', 'demo']):
+    if _SAFE_PATH_RE.search(file_path.lower()):
         return True
     
     # Check if line appears to be in a safe context
-    return any(re.match(pattern, line.lower()) for pattern in SAFE_CONTEXT_PATTERNS)
+    return _SAFE_CONTEXT.match(line_lower) is not None
 
 
 def is_safe_value(value: str) -> bool:
@@ -110,8 +161,7 @@ def is_safe_value(value: str) -> bool:
         return True
     
     # Check if it contains placeholder-like text
-    placeholder_indicators = ['your_', 'insert_', 'replace_', 'change_', 'enter_', 'add_', 'put_']
-    if any(indicator in clean_value for indicator in placeholder_indicators):
+    if _PLACEHOLDER_RE.search(clean_value):
         return True
     
     return False
@@ -120,12 +170,12 @@ def is_safe_value(value: str) -> bool:
 def extract_credential_value(match_text: str) -> str:
     """Extract the actual credential value from the match."""
     # Look for quoted strings
-    quote_match = re.search(r'["\']([^"\']+)["\']', match_text)
+    quote_match = _QUOTED_VALUE.search(match_text)
     if quote_match:
         return quote_match.group(1)
     
     # Look for unquoted values after = or :
-    value_match = re.search(r'[:=]\s*([^\s\'"]+)', match_text)
+    value_match = _BARE_VALUE.search(match_text)
     if value_match:
         return value_match.group(1)
     
@@ -134,68 +184,90 @@ def extract_credential_value(match_text: str) -> str:
 
 def is_base64_encoded(text: str) -> bool:
     """Check if text appears to be base64 encoded data."""
-    try:
-        if len(text) % 4 == 0 and re.match(r'^[A-Za-z0-9+/]*={0,2}$', text):
-            decoded = base64.b64decode(text)
-            # Check if decoded content looks like text
-            try:
-                decoded.decode('utf-8')
-                return len(text) > 20  # Only flag longer base64 strings
-            except UnicodeDecodeError:
-                return False
-    except:
-        pass
-    return False
+    # Only flag longer base64 strings; the shape is checked without decoding
+    return len(text) > 20 and len(text) % 4 == 0 and _BASE64.fullmatch(text) is not None
 
 
+def candidate_lines(content: str) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line_number, line) for lines that may contain a credential.
+    Every candidate is re-checked with the compiled patterns.
+    """
+    if _HYPERSCAN_DB is not None:
+        yield from hyperscan_lines(_HYPERSCAN_DB, content)
+    # Otherwise find the next keyword, then run the union on that line only
+    elif content.isascii():
+        yield from gated_lines(content, _KEYWORDS, content.lower(), _PATTERN_UNION)
+    else:
+        yield from gated_lines(content, _KEYWORDS_IGNORECASE, line_filter=_PATTERN_UNION)
+
+
+@cached_by_stat('hardcoded-credentials', decode=lambda issues: [tuple(issue) for issue in issues])
 def find_hardcoded_credentials(file_path: str) -> List[Tuple[int, str, str, str]]:
     """
     Find hardcoded credentials in a file.
     Returns list of (line_number, line_content, credential_type, value) tuples.
     """
-    issues = []
+    issues: List[Tuple[int, str, str, str]] = []
     
     # Skip binary files and certain extensions
-    if any(file_path.endswith(ext) for ext in SKIP_EXTENSIONS):
+    if os.path.splitext(file_path)[1].lower() in SKIP_EXTENSIONS:
         return issues
     
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                # Skip empty lines
-                if not line.strip():
-                    continue
-                
-                # Check each credential pattern type
-                for cred_type, patterns in CREDENTIAL_PATTERNS.items():
-                    for pattern in patterns:
-                        matches = re.finditer(pattern, line, re.IGNORECASE)
-                        for match in matches:
-                            match_text = match.group()
-                            credential_value = extract_credential_value(match_text)
-                            
-                            # Skip if it's a safe value
-                            if is_safe_value(credential_value):
-                                continue
-                            
-                            # Be more lenient in safe contexts (tests, examples, comments)
-                            if is_safe_context(line, file_path):
-                                # Only flag very suspicious patterns in safe contexts
-                                if len(credential_value) > 30 or is_base64_encoded(credential_value):
-                                    issues.append((line_num, line.strip(), cred_type, credential_value))
-                            else:
+        if os.path.getsize(file_path) > MAX_FILE_SIZE:
+            return issues
+        
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        
+        # Skip binary files the extension check missed, before decoding
+        if b'\0' in raw[:BINARY_SNIFF_SIZE]:
+            return issues
+        
+        # An ASCII file without a single keyword cannot match; skip it before
+        # decoding.  Other files may hide a keyword behind case folding or
+        # undecodable bytes, so they always take the full path.
+        if raw.isascii() and _KEYWORDS_BYTES.search(raw.lower()) is None:
+            return issues
+        
+        content = raw.decode('utf-8', errors='ignore')
+        if '\r' in content:
+            # Same newline translation text-mode reads apply
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        # Only lines some credential pattern can match are checked
+        for line_num, line in candidate_lines(content):
+            line_lower = line.lower()
+            # Check each credential pattern type
+            for cred_type, patterns in _COMPILED_PATTERNS.items():
+                for pattern in patterns:
+                    for match in pattern.finditer(line):
+                        if pattern.groups:
+                            credential_value = match.group(1)
+                        else:
+                            credential_value = extract_credential_value(match.group())
+                        
+                        # Skip if it's a safe value
+                        if is_safe_value(credential_value):
+                            continue
+                        
+                        # Be more lenient in safe contexts (tests, examples, comments)
+                        if is_safe_context(line_lower, file_path):
+                            # Only flag very suspicious patterns in safe contexts
+                            if len(credential_value) > 30 or is_base64_encoded(credential_value):
                                 issues.append((line_num, line.strip(), cred_type, credential_value))
+                        else:
+                            issues.append((line_num, line.strip(), cred_type, credential_value))
     
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
+        skip_caching()
     
     return issues
 
 
-def main():
+def main() -> int:
     parser = argparse.ArgumentParser(description='Detect hardcoded credentials in code')
     parser.add_argument('files', nargs='*', help='Files to check')
     parser.add_argument('--show-values', action='store_true',
@@ -205,8 +277,9 @@ def main():
     exit_code = 0
     total_issues = 0
     
-    for file_path in args.files:
-        issues = find_hardcoded_credentials(file_path)
+    results = map_files(find_hardcoded_credentials, args.files)
+    
+    for file_path, issues in zip(args.files, results):
         
         if issues:
             print(f"\n🔐 Hardcoded credentials found in {file_path}:")
@@ -233,4 +306,4 @@ def main():
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit((compiled_main('detect_hardcoded_credentials') or main)())
@@ -4,10 +4,22 @@ Detect hardcoded URLs in code files.
 Specifically designed to catch URLs that might be accidentally included by GenAI tools.
 """
 
+import os
 import re
 import sys
 import argparse
-from typing import List, Tuple, Set
+import functools
+from typing import Any, List, Tuple, Set
+from urllib.parse import urlsplit
+
+try:
+    from _compiled import compiled_main
+    from _parallel import map_files
+    from _patterns import ENGINES, compile_bytes_union, compile_gate, scan_file
+except ImportError:  # imported from the installed hooks package
+    from hooks._compiled import compiled_main
+    from hooks._parallel import map_files
+    from hooks._patterns import ENGINES, compile_bytes_union, compile_gate, scan_file
 
 # Common patterns that indicate hardcoded URLs
 URL_PATTERNS = [
@@ -21,7 +33,27 @@ URL_PATTERNS = [
     r'(?:api\.|www\.)[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?:/[^\s\'">\]]*)?',
 ]
 
-# URLs that are typically safe to ignore
+# Every URL pattern contains one of these (compared lowercase); keep in sync
+URL_SENTINELS = (b'://', b'api.', b'www.')
+
+# Hosts of http(s) URLs that are typically safe to ignore
+SAFE_HOSTS = frozenset({
+    'localhost', '127.0.0.1', '0.0.0.0',
+    'example.com', 'example.org', 'example.net',
+    # Common documentation URLs
+    'github.com', 'www.w3.org', 'tools.ietf.org',
+    # Package registries
+    'registry.npmjs.org', 'pypi.org', 'central.maven.org',
+})
+SAFE_HOST_SUFFIXES = ('.example.com', '.test', '.local', '.localhost')
+SAFE_HOST_PREFIXES = ('docs.', 'schemas.')
+
+# A host is compared up to the first character no host name has, so punctuation
+# a URL match ran on into (as in "see (http://localhost)") is not compared
+_HOST_NAME_END = re.compile(r'[^a-z0-9._-]')
+
+# Safe URLs as matched before hosts were compared (--legacy-safe-urls); these
+# are prefix matches, so e.g. http://localhost.attacker.com counts as safe
 SAFE_URL_PATTERNS = [
     r'https?://localhost',
     r'https?://127\.0\.0\.1',
@@ -45,65 +77,97 @@ SAFE_URL_PATTERNS = [
     r'https?://central\.maven\.org/.*',
 ]
 
-# File extensions to skip
-SKIP_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg', '.pdf', '.zip', '.tar', '.gz'}
+# File extensions to skip, in lowercase; file names are matched case-insensitively
+SKIP_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg', '.pdf', '.zip', '.tar', '.gz'})
 
-# Patterns that suggest this might be in a comment or documentation
-COMMENT_PATTERNS = [
-    r'^\s*#',     # Python, shell comments
-    r'^\s*//',    # JavaScript, Java, C++ comments
-    r'^\s*/\*',   # Multi-line comment start
-    r'^\s*\*',    # Multi-line comment continuation
-    r'^\s*<!--',  # HTML comments
-]
+# URL substrings still reported when the URL appears in a comment
+SUSPICIOUS_URL_KEYWORDS = ('api', 'prod', 'staging', 'internal', 'admin')
+
+# Line prefixes (after indentation) that suggest a comment or documentation
+COMMENT_PREFIXES = (
+    '#',     # Python, shell comments
+    '//',    # JavaScript, Java, C++ comments
+    '/*',    # Multi-line comment start
+    '*',     # Multi-line comment continuation
+    '<!--',  # HTML comments
+)
+
+_URL_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in URL_PATTERNS]
+# Any URL pattern, searched in the undecoded file to skip files without URLs
+_BYTES_GATE = compile_bytes_union({'url': URL_PATTERNS})
+# Matching any alternative is all the safe URL check needs
+_SAFE_URL = re.compile('|'.join(f'(?:{pattern})' for pattern in SAFE_URL_PATTERNS), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=None)
+def line_gate(engine: str) -> Tuple[str, Any]:
+    """Compile the URL patterns into one line gate for a matching engine."""
+    gate: Tuple[str, Any] = compile_gate({'url': URL_PATTERNS}, engine)
+    return gate
 
 
 def is_in_comment(line: str) -> bool:
     """Check if the line appears to be a comment."""
-    return any(re.match(pattern, line) for pattern in COMMENT_PATTERNS)
+    return line.lstrip().startswith(COMMENT_PREFIXES)
 
 
 def is_safe_url(url: str) -> bool:
-    """Check if URL matches safe patterns."""
-    return any(re.match(pattern, url, re.IGNORECASE) for pattern in SAFE_URL_PATTERNS)
+    """Check if URL is an http(s) URL to a safe host."""
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+    except ValueError:
+        # Not parseable as a URL, e.g. an unbalanced '[' in the host
+        return False
+    if parts.scheme not in ('http', 'https') or not host:
+        return False
+    host = _HOST_NAME_END.split(host, 1)[0].rstrip('.')
+    return host in SAFE_HOSTS or host.endswith(SAFE_HOST_SUFFIXES) or host.startswith(SAFE_HOST_PREFIXES)
+
+
+def _legacy_is_safe_url(url: str) -> bool:
+    """Check if URL matches the legacy safe patterns."""
+    return _SAFE_URL.match(url) is not None
 
 
-def find_hardcoded_urls(file_path: str) -> List[Tuple[int, str, str]]:
+def find_hardcoded_urls(file_path: str, engine: str = 're', legacy_safe_urls: bool = False) -> List[Tuple[int, str, str]]:
     """
     Find hardcoded URLs in a file.
     Returns list of (line_number, line_content, url) tuples.
     """
-    issues = []
+    issues: List[Tuple[int, str, str]] = []
+    safe_url = _legacy_is_safe_url if legacy_safe_urls else is_safe_url
     
     # Skip binary files and certain extensions
-    if any(file_path.endswith(ext) for ext in SKIP_EXTENSIONS):
+    if os.path.splitext(file_path)[1].lower() in SKIP_EXTENSIONS:
         return issues
     
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f, 1):
-                # Skip empty lines
-                if not line.strip():
-                    continue
-                
-                # Check for URL patterns
-                for pattern in URL_PATTERNS:
-                    matches = re.finditer(pattern, line, re.IGNORECASE)
-                    for match in matches:
-                        url = match.group()
-                        
-                        # Skip safe URLs
-                        if is_safe_url(url):
-                            continue
-                        
-                        # Be more lenient with URLs in comments/documentation
-                        if is_in_comment(line):
-                            # Only flag suspicious URLs even in comments
-                            if any(keyword in url.lower() for keyword in 
-                                   ['api', 'prod', 'staging', 'internal', 'admin']):
-                                issues.append((line_num, line.strip(), url))
-                        else:
-                            issues.append((line_num, line.strip(), url))
+        # Only lines some URL pattern matches are checked pattern by pattern
+        for line_num, line in scan_file(file_path, line_gate(engine), _BYTES_GATE, URL_SENTINELS):
+            # Skip empty lines
+            stripped_line = line.strip()
+            if not stripped_line:
+                continue
+            in_comment = is_in_comment(line)
+            
+            # Check for URL patterns
+            for pattern in _URL_PATTERNS:
+                for match in pattern.finditer(line):
+                    url = match.group()
+                    
+                    # Skip safe URLs
+                    if safe_url(url):
+                        continue
+                    
+                    # Be more lenient with URLs in comments/documentation
+                    if in_comment:
+                        # Only flag suspicious URLs even in comments
+                        url_lower = url.lower()
+                        if any(keyword in url_lower for keyword in SUSPICIOUS_URL_KEYWORDS):
+                            issues.append((line_num, stripped_line, url))
+                    else:
+                        issues.append((line_num, stripped_line, url))
     
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
@@ -111,24 +175,37 @@ def find_hardcoded_urls(file_path: str) -> List[Tuple[int, str, str]]:
     return issues
 
 
-def main():
+def print_issues(file_path: str, issues: List[Tuple[int, str, str]]) -> None:
+    """Print one file's hardcoded URLs."""
+    print(f"\n🚨 Hardcoded URLs found in {file_path}:")
+    for line_num, line_content, url in issues:
+        print(f"  Line {line_num}: {url}")
+        print(f"    Context: {line_content}")
+
+
+def main() -> int:
     parser = argparse.ArgumentParser(description='Detect hardcoded URLs in code')
     parser.add_argument('files', nargs='*', help='Files to check')
     parser.add_argument('--exclude-comments', action='store_true',
                         help='Exclude URLs found in comments')
+    parser.add_argument('--engine', choices=ENGINES, default='re',
+                        help='Regex engine used to find candidate lines (default: re)')
+    parser.add_argument('--legacy-safe-urls', action='store_true',
+                        help='Match safe URLs with the old prefix patterns instead of by host')
     args = parser.parse_args()
     
     exit_code = 0
     total_issues = 0
     
-    for file_path in args.files:
-        issues = find_hardcoded_urls(file_path)
+    # Compiled before the pool starts, so forked workers inherit the gate
+    # (spawned workers compile their own on first use)
+    line_gate(args.engine)
+    results = map_files(find_hardcoded_urls, args.files, (args.engine, args.legacy_safe_urls))
+    
+    for file_path, issues in zip(args.files, results):
         
         if issues:
-            print(f"\n🚨 Hardcoded URLs found in {file_path}:")
-            for line_num, line_content, url in issues:
-                print(f"  Line {line_num}: {url}")
-                print(f"    Context: {line_content}")
+            print_issues(file_path, issues)
             
             total_issues += len(issues)
             exit_code = 1
@@ -144,4 +221,4 @@ def main():
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit((compiled_main('detect_hardcoded_urls') or main)())
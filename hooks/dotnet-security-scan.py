@@ -4,13 +4,21 @@
 Focused on ASP.NET, .NET Core, and .NET Framework security issues.
 """
 
-import re
 import sys
 import argparse
-import json
+import functools
 from typing import List, Tuple, Dict
 from pathlib import Path
 
+try:
+    from _parallel import map_files
+    from _patterns import ENGINES, SeverityPatterns, gate_lines, matching_patterns, read_text, scan_file
+    from _report import JsonReport, issue_records, pattern_emoji, pattern_severities, severity_level
+except ImportError:  # imported from the installed hooks package
+    from hooks._parallel import map_files
+    from hooks._patterns import ENGINES, SeverityPatterns, gate_lines, matching_patterns, read_text, scan_file
+    from hooks._report import JsonReport, issue_records, pattern_emoji, pattern_severities, severity_level
+
 # .NET specific security patterns
 DOTNET_SECURITY_PATTERNS = {
     'sql_injection': {
@@ -135,7 +143,23 @@ DOTNET_EXTENSIONS = {'.cs', '.vb', '.fs', '.aspx', '.ascx', '.ashx', '.asmx', '.
 # Configuration files that need special attention
 CONFIG_FILES = {'web.config', 'app.config', 'appsettings.json', 'appsettings.*.json'}
 
+# Config settings that hold secrets, and markers of a placeholder value
+CONFIG_SECRET_KEYWORDS = ('password=', 'pwd=', 'secret=', 'key=')
+CONFIG_PLACEHOLDER_MARKERS = ('$(', '${', '%', 'placeholder', 'your_')
+
+_SEVERITY_INT = pattern_severities(DOTNET_SECURITY_PATTERNS)
+_SEVERITY_EMOJI = pattern_emoji(DOTNET_SECURITY_PATTERNS)
+
+_PATTERN_TABLE = {
+    pattern_name: pattern_info['patterns']
+    for pattern_name, pattern_info in DOTNET_SECURITY_PATTERNS.items()
+}
+_PATTERNS = SeverityPatterns(_PATTERN_TABLE, _SEVERITY_INT)
+active_patterns = _PATTERNS.active_patterns
+line_gate = _PATTERNS.line_gate
+
 
+@functools.lru_cache(maxsize=8192)
 def should_check_file(file_path: str) -> bool:
     """Determine if file should be checked for .NET security issues."""
     path = Path(file_path)
@@ -148,8 +172,9 @@ def should_check_file(file_path: str) -> bool:
     if path.name.lower() in CONFIG_FILES:
         return True
     
-    # Check appsettings pattern
-    if re.match(r'appsettings\..*\.json$', path.name.lower()):
+    # Check appsettings.<environment>.json
+    name = path.name.lower()
+    if name.startswith('appsettings.') and name.endswith('.json'):
         return True
     
     return False
@@ -164,8 +189,8 @@ def analyze_config_file(file_path: str, content: str) -> List[Tuple[int, str, st
         line_lower = line.lower()
         
         # Check for sensitive data in config files
-        if any(keyword in line_lower for keyword in ['password=', 'pwd=', 'secret=', 'key=']):
-            if not any(safe in line_lower for safe in ['$(', '${', '%', 'placeholder', 'your_']):
+        if any(keyword in line_lower for keyword in CONFIG_SECRET_KEYWORDS):
+            if not any(safe in line_lower for safe in CONFIG_PLACEHOLDER_MARKERS):
                 issues.append((
                     line_num,
                     line.strip(),
@@ -193,37 +218,47 @@ def analyze_config_file(file_path: str, content: str) -> List[Tuple[int, str, st
     return issues
 
 
-def check_dotnet_security(file_path: str) -> List[Tuple[int, str, str, str]]:
-    """Check for .NET specific security patterns."""
+def check_dotnet_security(file_path: str, engine: str = 're', min_severity: int = 1) -> List[Tuple[int, str, str, str]]:
+    """
+    Check for .NET specific security patterns.  Patterns below min_severity
+    are not run, and config findings named after one of them are dropped.
+    """
     issues = []
     
     if not should_check_file(file_path):
         return issues
     
+    compiled, literals, bytes_gate = active_patterns(min_severity)
+    
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            lines = content.split('\n')
-        
         # Special handling for config files
         if any(config in Path(file_path).name.lower() for config in CONFIG_FILES):
-            issues.extend(analyze_config_file(file_path, content))
+            content = read_text(file_path)
+            # Config findings outside the pattern table are always kept
+            issues.extend(
+                issue for issue in analyze_config_file(file_path, content)
+                if _SEVERITY_INT.get(issue[2], min_severity) >= min_severity
+            )
+            lines = gate_lines(content, line_gate(engine, min_severity))
+        else:
+            # Source files are streamed block by block
+            lines = scan_file(file_path, line_gate(engine, min_severity), bytes_gate)
         
         # Pattern-based analysis for source files
-        for line_num, line in enumerate(lines, 1):
-            if not line.strip():
+        # Only lines the combined patterns match are checked pattern by pattern
+        for line_num, line in lines:
+            stripped_line = line.strip()
+            if not stripped_line:
                 continue
             
             # Check security patterns
-            for pattern_name, pattern_info in DOTNET_SECURITY_PATTERNS.items():
-                for pattern in pattern_info['patterns']:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        issues.append((
-                            line_num,
-                            line.strip(),
-                            pattern_name,
-                            pattern_info['description']
-                        ))
+            for pattern_name in matching_patterns(line, compiled, literals):
+                issues.append((
+                    line_num,
+                    stripped_line,
+                    pattern_name,
+                    DOTNET_SECURITY_PATTERNS[pattern_name]['description']
+                ))
     
     except Exception as e:
         print(f"Error analyzing {file_path}: {e}", file=sys.stderr)
@@ -233,16 +268,18 @@ def check_dotnet_security(file_path: str) -> List[Tuple[int, str, str, str]]:
 
 def get_severity_emoji(pattern_name: str) -> str:
     """Get emoji based on severity."""
-    if pattern_name in DOTNET_SECURITY_PATTERNS:
-        severity = DOTNET_SECURITY_PATTERNS[pattern_name]['severity']
-    else:
-        severity = 'medium'
-    
-    return {
-        'high': '🚨',
-        'medium': '⚠️',
-        'low': '💡'
-    }.get(severity, '⚠️')
+    return _SEVERITY_EMOJI.get(pattern_name, '⚠️')
+
+
+def print_issues(file_path: str, issues: List[Tuple[int, str, str, str]]) -> None:
+    """Print one file's .NET security issues."""
+    print(f"\n⚡ .NET security issues found in {file_path}:")
+    for line_num, line_content, pattern_name, description in issues:
+        emoji = get_severity_emoji(pattern_name)
+        print(f"  {emoji} Line {line_num}: {pattern_name.replace('_', ' ').title()}")
+        print(f"    Description: {description}")
+        if line_content:
+            print(f"    Code: {line_content}")
 
 
 def main():
@@ -250,57 +287,40 @@ def main():
     parser.add_argument('files', nargs='*', help='Files to check')
     parser.add_argument('--severity', choices=['low', 'medium', 'high'],
                         help='Minimum severity level to report')
-    parser.add_argument('--json', action='store_true',
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--json', action='store_true',
                         help='Output results in JSON format')
+    output.add_argument('--json-lines', action='store_true',
+                        help='Output one JSON object per file with issues, as each file is scanned')
+    parser.add_argument('--engine', choices=ENGINES, default='re',
+                        help='Regex engine used to find candidate lines (default: re)')
     args = parser.parse_args()
     
     exit_code = 0
     total_issues = 0
-    all_results = {}
+    report = JsonReport(args.json_lines) if args.json or args.json_lines else None
     
-    severity_levels = {'low': 1, 'medium': 2, 'high': 3}
-    min_severity = severity_levels.get(args.severity, 1) if args.severity else 1
+    min_severity = severity_level(args.severity)
     
-    for file_path in args.files:
-        issues = check_dotnet_security(file_path)
-        
-        # Filter by severity if specified
-        if args.severity:
-            filtered_issues = []
-            for line_num, line_content, pattern_name, description in issues:
-                if pattern_name in DOTNET_SECURITY_PATTERNS:
-                    pattern_severity = DOTNET_SECURITY_PATTERNS[pattern_name]['severity']
-                    if severity_levels.get(pattern_severity, 1) >= min_severity:
-                        filtered_issues.append((line_num, line_content, pattern_name, description))
-                else:
-                    filtered_issues.append((line_num, line_content, pattern_name, description))
-            issues = filtered_issues
-        
+    # Compiled before the pool starts, so forked workers inherit the gate
+    # (spawned workers compile their own on first use); patterns below the
+    # minimum severity are skipped inside the scan
+    active_patterns(min_severity)
+    line_gate(args.engine, min_severity)
+    results = map_files(check_dotnet_security, args.files, (args.engine, min_severity))
+    
+    for file_path, issues in zip(args.files, results):
         if issues:
-            if args.json:
-                all_results[file_path] = [
-                    {
-                        'line': line_num,
-                        'content': line_content,
-                        'pattern': pattern_name,
-                        'description': description
-                    }
-                    for line_num, line_content, pattern_name, description in issues
-                ]
+            if report is not None:
+                report.add(file_path, issue_records(issues))
             else:
-                print(f"\n⚡ .NET security issues found in {file_path}:")
-                for line_num, line_content, pattern_name, description in issues:
-                    emoji = get_severity_emoji(pattern_name)
-                    print(f"  {emoji} Line {line_num}: {pattern_name.replace('_', ' ').title()}")
-                    print(f"    Description: {description}")
-                    if line_content:
-                        print(f"    Code: {line_content}")
+                print_issues(file_path, issues)
             
             total_issues += len(issues)
             exit_code = 1
     
-    if args.json:
-        print(json.dumps(all_results, indent=2))
+    if report is not None:
+        report.finish()
     elif total_issues > 0:
         print(f"\n❌ Found {total_issues} potential .NET security issue(s)")
         print("💡 Review .NET code for security vulnerabilities")
@@ -8,10 +8,18 @@ import re
 import sys
 import argparse
 import ast
-import json
 from typing import List, Tuple, Dict, Set, Any
 from pathlib import Path
 
+try:
+    from _parallel import map_files
+    from _patterns import compile_patterns
+    from _report import JsonReport, issue_records, pattern_emoji, pattern_severities, severity_level
+except ImportError:  # imported from the installed hooks package
+    from hooks._parallel import map_files
+    from hooks._patterns import compile_patterns
+    from hooks._report import JsonReport, issue_records, pattern_emoji, pattern_severities, severity_level
+
 # Common GenAI security anti-patterns
 GENAI_SECURITY_PATTERNS = {
     'insecure_random': {
@@ -153,6 +161,15 @@ SUSPICIOUS_COMMENT_PATTERNS = [
 # File extensions to analyze
 SUPPORTED_EXTENSIONS = {'.py', '.js', '.ts', '.java', '.php', '.cs', '.cpp', '.c', '.go', '.rb', '.scala'}
 
+_COMPILED_PATTERNS = compile_patterns({
+    pattern_name: pattern_info['patterns']
+    for pattern_name, pattern_info in GENAI_SECURITY_PATTERNS.items()
+})
+_SUSPICIOUS_COMMENTS = [re.compile(pattern, re.IGNORECASE) for pattern in SUSPICIOUS_COMMENT_PATTERNS]
+
+_SEVERITY_INT = pattern_severities(GENAI_SECURITY_PATTERNS)
+_SEVERITY_EMOJI = pattern_emoji(GENAI_SECURITY_PATTERNS)
+
 
 def analyze_python_ast(file_path: str, content: str) -> List[Tuple[int, str, str]]:
     """Analyze Python AST for security issues."""
@@ -213,26 +230,27 @@ def check_genai_patterns(file_path: str) -> List[Tuple[int, str, str, str]]:
             
             # Pattern-based analysis
             for line_num, line in enumerate(lines, 1):
-                if not line.strip():
+                stripped_line = line.strip()
+                if not stripped_line:
                     continue
                 
                 # Check security patterns
-                for pattern_name, pattern_info in GENAI_SECURITY_PATTERNS.items():
-                    for pattern in pattern_info['patterns']:
-                        if re.search(pattern, line, re.IGNORECASE):
+                for pattern_name, patterns in _COMPILED_PATTERNS.items():
+                    for pattern in patterns:
+                        if pattern.search(line):
                             issues.append((
                                 line_num,
-                                line.strip(),
+                                stripped_line,
                                 pattern_name,
-                                pattern_info['description']
+                                GENAI_SECURITY_PATTERNS[pattern_name]['description']
                             ))
                 
                 # Check suspicious comments
-                for comment_pattern in SUSPICIOUS_COMMENT_PATTERNS:
-                    if re.search(comment_pattern, line, re.IGNORECASE):
+                for comment_pattern in _SUSPICIOUS_COMMENTS:
+                    if comment_pattern.search(line):
                         issues.append((
                             line_num,
-                            line.strip(),
+                            stripped_line,
                             'suspicious_comment',
                             'Suspicious comment indicating potential security issue'
                         ))
@@ -251,14 +269,7 @@ def check_genai_patterns(file_path: str) -> List[Tuple[int, str, str, str]]:
 
 def get_severity_emoji(pattern_name: str) -> str:
     """Get emoji based on severity."""
-    if pattern_name in GENAI_SECURITY_PATTERNS:
-        severity = GENAI_SECURITY_PATTERNS[pattern_name]['severity']
-        return {
-            'high': '🚨',
-            'medium': '⚠️',
-            'low': '💡'
-        }.get(severity, '⚠️')
-    return '⚠️'
+    return _SEVERITY_EMOJI.get(pattern_name, '⚠️')
 
 
 def main():
@@ -266,43 +277,34 @@ def main():
     parser.add_argument('files', nargs='*', help='Files to check')
     parser.add_argument('--severity', choices=['low', 'medium', 'high'],
                         help='Minimum severity level to report')
-    parser.add_argument('--json', action='store_true',
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--json', action='store_true',
                         help='Output results in JSON format')
+    output.add_argument('--json-lines', action='store_true',
+                        help='Output one JSON object per file with issues, as each file is scanned')
     args = parser.parse_args()
     
     exit_code = 0
     total_issues = 0
-    all_results = {}
+    report = JsonReport(args.json_lines) if args.json or args.json_lines else None
+    
+    min_severity = severity_level(args.severity)
     
-    severity_levels = {'low': 1, 'medium': 2, 'high': 3}
-    min_severity = severity_levels.get(args.severity, 1) if args.severity else 1
+    results = map_files(check_genai_patterns, args.files)
     
-    for file_path in args.files:
-        issues = check_genai_patterns(file_path)
+    for file_path, issues in zip(args.files, results):
         
         # Filter by severity if specified
         if args.severity:
-            filtered_issues = []
-            for line_num, line_content, pattern_name, description in issues:
-                if pattern_name in GENAI_SECURITY_PATTERNS:
-                    pattern_severity = GENAI_SECURITY_PATTERNS[pattern_name]['severity']
-                    if severity_levels.get(pattern_severity, 1) >= min_severity:
-                        filtered_issues.append((line_num, line_content, pattern_name, description))
-                else:
-                    filtered_issues.append((line_num, line_content, pattern_name, description))
-            issues = filtered_issues
+            # Issues from outside the pattern table are always kept
+            issues = [
+                issue for issue in issues
+                if _SEVERITY_INT.get(issue[2], min_severity) >= min_severity
+            ]
         
         if issues:
-            if args.json:
-                all_results[file_path] = [
-                    {
-                        'line': line_num,
-                        'content': line_content,
-                        'pattern': pattern_name,
-                        'description': description
-                    }
-                    for line_num, line_content, pattern_name, description in issues
-                ]
+            if report is not None:
+                report.add(file_path, issue_records(issues))
             else:
                 print(f"\n🤖 GenAI security issues found in {file_path}:")
                 for line_num, line_content, pattern_name, description in issues:
@@ -315,8 +317,8 @@ def main():
             total_issues += len(issues)
             exit_code = 1
     
-    if args.json:
-        print(json.dumps(all_results, indent=2))
+    if report is not None:
+        report.finish()
     elif total_issues > 0:
         print(f"\n❌ Found {total_issues} potential GenAI security issue(s)")
         print("💡 Review AI-generated code carefully for security vulnerabilities")
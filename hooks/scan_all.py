@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Run the hardcoded URL, verbose flag and .NET security scans in one hook.
+
+Enabling the three hooks separately starts three interpreters, compiles three
+sets of pattern tables and spins up three worker pools per commit. This hook
+loads the scanners once and runs all of them on each file in the same worker,
+reporting exactly what the individual hooks would, .NET scan file filter included.
+"""
+
+import os
+import re
+import sys
+import argparse
+import importlib.util
+from types import ModuleType
+from typing import Any, Dict, List
+
+try:
+    from _parallel import map_files
+    from _patterns import ENGINES
+    from _report import JsonReport, issue_records, severity_level
+    import detect_hardcoded_urls as urls
+except ImportError:  # imported from the installed hooks package
+    from hooks._parallel import map_files
+    from hooks._patterns import ENGINES
+    from hooks._report import JsonReport, issue_records, severity_level
+    from hooks import detect_hardcoded_urls as urls
+
+
+def _load_hook(file_name: str) -> ModuleType:
+    """Import a hook script from this directory; hyphenated names are not importable."""
+    name = os.path.splitext(file_name)[0].replace('-', '_')
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+verbose = _load_hook('detect-verbose-flags.py')
+dotnet = _load_hook('dotnet-security-scan.py')
+
+# Hook id of each scan, in the order its issues are reported for a file
+SCANS = ('hardcoded-urls', 'detect-verbose-flags', 'dotnet-security-scan')
+
+# The files: filter of the dotnet-security-scan hook; keep in sync
+DOTNET_HOOK_FILES = re.compile(r'\.(cs|vb|fs|config|json)$')
+
+
+def scan_file(file_path: str, engine: str = 're', min_severity: int = 1, legacy_safe_urls: bool = False,
+              exclude_safe_contexts: bool = False) -> Dict[str, List[Any]]:
+    """Run every scan on a file, returning the issues of those that found any."""
+    results = {'hardcoded-urls': urls.find_hardcoded_urls(file_path, engine, legacy_safe_urls)}
+    if not (exclude_safe_contexts and verbose.is_safe_context(file_path)):
+        results['detect-verbose-flags'] = verbose.check_verbose_flags(file_path, engine, min_severity)
+    if DOTNET_HOOK_FILES.search(file_path):
+        results['dotnet-security-scan'] = dotnet.check_dotnet_security(file_path, engine, min_severity)
+    return {scan: issues for scan, issues in results.items() if issues}
+
+
+def scan_records(scan: str, issues: List[Any]) -> List[Dict[str, Any]]:
+    """Turn one scan's issues into report records."""
+    if scan == 'hardcoded-urls':
+        return [
+            {'line': line_num, 'content': line_content, 'url': url}
+            for line_num, line_content, url in issues
+        ]
+    return issue_records(issues)
+
+
+def print_issues(file_path: str, scan: str, issues: List[Any]) -> None:
+    """Print one scan's issues the way its own hook does."""
+    if scan == 'hardcoded-urls':
+        urls.print_issues(file_path, issues)
+    elif scan == 'detect-verbose-flags':
+        verbose.print_issues(file_path, issues)
+    else:
+        dotnet.print_issues(file_path, issues)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Detect hardcoded URLs, verbose flags and .NET security issues in one pass')
+    parser.add_argument('files', nargs='*', help='Files to check')
+    parser.add_argument('--severity', choices=['low', 'medium', 'high'],
+                        help='Minimum severity level of verbose flag and .NET issues to report')
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--json', action='store_true',
+                        help='Output results in JSON format')
+    output.add_argument('--json-lines', action='store_true',
+                        help='Output one JSON object per file with issues, as each file is scanned')
+    parser.add_argument('--exclude-safe-contexts', action='store_true',
+                        help='Skip the verbose flag scan in safe contexts (test, dev, example directories)')
+    parser.add_argument('--legacy-safe-urls', action='store_true',
+                        help='Match safe URLs with the old prefix patterns instead of by host')
+    parser.add_argument('--engine', choices=ENGINES, default='re',
+                        help='Regex engine used to find candidate lines (default: re)')
+    args = parser.parse_args()
+    
+    exit_code = 0
+    totals = dict.fromkeys(SCANS, 0)
+    report = JsonReport(args.json_lines) if args.json or args.json_lines else None
+    
+    min_severity = severity_level(args.severity)
+    
+    # Compiled before the pool starts, so forked workers inherit every gate
+    # (spawned workers compile their own on first use)
+    urls.line_gate(args.engine)
+    for hook in (verbose, dotnet):
+        hook.active_patterns(min_severity)
+        hook.line_gate(args.engine, min_severity)
+    results = map_files(scan_file, args.files,
+                        (args.engine, min_severity, args.legacy_safe_urls, args.exclude_safe_contexts))
+    
+    for file_path, found in zip(args.files, results):
+        if found:
+            if report is not None:
+                report.add(file_path, {scan: scan_records(scan, issues) for scan, issues in found.items()})
+            else:
+                for scan, issues in found.items():
+                    print_issues(file_path, scan, issues)
+            
+            for scan, issues in found.items():
+                totals[scan] += len(issues)
+            exit_code = 1
+    
+    if report is not None:
+        report.finish()
+    elif exit_code:
+        print()
+        if totals['hardcoded-urls']:
+            print(f"❌ Found {totals['hardcoded-urls']} hardcoded URL(s)")
+        if totals['detect-verbose-flags']:
+            print(f"❌ Found {totals['detect-verbose-flags']} verbose flag(s) or debug configuration(s)")
+        if totals['dotnet-security-scan']:
+            print(f"❌ Found {totals['dotnet-security-scan']} potential .NET security issue(s)")
+        print("💡 Use environment variables or configuration files for URLs and debug settings")
+        if totals['dotnet-security-scan']:
+            print("💡 Review .NET code for security vulnerabilities")
+    else:
+        print("✅ No hardcoded URLs, verbose flags or .NET security issues detected")
+    
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Shared fixtures for the hook tests.
+
+The hooks run as standalone scripts from hooks/ and import their shared
+modules (_patterns, _report, ...) by bare name, so that directory is put on
+sys.path here. Hyphenated scripts cannot be imported by name and are loaded
+from their file with the load_hook fixture.
+"""
+
+import importlib.util
+import os
+import sys
+from types import ModuleType
+from typing import Callable
+
+import pytest
+
+HOOKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'hooks')
+sys.path.insert(0, HOOKS_DIR)
+
+
+def _load_hook(file_name: str) -> ModuleType:
+    """Import a hook script from hooks/ under a module name derived from its file name."""
+    name = os.path.splitext(file_name)[0].replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HOOKS_DIR, file_name))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def load_hook() -> Callable[[str], ModuleType]:
+    return _load_hook
@@ -0,0 +1,63 @@
+import pytest
+import yaml
+
+
+@pytest.fixture
+def ansible(load_hook):
+    return load_hook('ansible-security-scan.py')
+
+
+def old_analyze_yaml_content(ansible, data):
+    """analyze_yaml_content as it was before it walked the tree."""
+    if not data:
+        return False
+    content_str = str(data).lower()
+    return any(indicator in content_str for indicator in ansible.ANSIBLE_INDICATORS)
+
+
+ROLE_TASKS = '''\
+- name: Download the release
+  get_url:
+    url: http://downloads.mycompany.com/app.tar.gz
+    dest: /tmp/app.tar.gz
+  when: ansible_os_family == "Debian"
+
+- name: Greet
+  shell: "echo {{ user_input }}"
+'''
+
+
+@pytest.mark.parametrize('document', [
+    ROLE_TASKS,
+    '- hosts: all\n  tasks: []\n',
+    '- name: x\n  become_user: root\n',
+    'my_vars:\n  a: 1\n',
+    'description: runs on all HOSTS\n',
+    'plain: value\nother: [1, 2.5, true, null]\n',
+    'key: !!binary aG9zdHM=\n',
+    'pairs: !!pairs [{a: tasks}]\n',
+    '',
+    'just a string with handlers in it\n',
+    '42\n',
+])
+def test_analyze_yaml_content_matches_str_search(ansible, document):
+    data = yaml.safe_load(document)
+    assert ansible.analyze_yaml_content(data) == old_analyze_yaml_content(ansible, data)
+
+
+@pytest.mark.parametrize('document', [
+    'foo: &a\n  - bar\n  - *a\n',
+    'x: &a\n  k: *a\n',
+    'x: &a\n  k: *a\nhosts: all\n',
+])
+def test_analyze_yaml_content_stops_on_recursive_aliases(ansible, document):
+    data = yaml.safe_load(document)
+    assert ansible.analyze_yaml_content(data) == ('hosts' in document)
+
+
+def test_role_tasks_with_markers_only_in_values_are_scanned(ansible, tmp_path):
+    path = tmp_path / 'roles' / 'web' / 'tasks' / 'main.yml'
+    path.parent.mkdir(parents=True)
+    path.write_text(ROLE_TASKS)
+    issues = ansible.check_ansible_security(str(path))
+    assert sorted((line, name) for line, _, name, _ in issues) == [(3, 'http_usage'), (8, 'shell_injection')]
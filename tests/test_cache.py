@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+import _cache
+import detect_hardcoded_credentials as credentials
+from _cache import cached_by_stat, skip_caching
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A working directory with a .git directory, where the cache is enabled."""
+    (tmp_path / '.git').mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv(_cache.DISABLE_ENV_VAR, raising=False)
+    return tmp_path
+
+
+def cache_entries(namespace):
+    directory = os.path.join(_cache.CACHE_DIR, namespace)
+    return os.listdir(directory) if os.path.isdir(directory) else []
+
+
+def test_results_are_reused_until_the_file_changes(repo):
+    calls = []
+
+    @cached_by_stat('test-reuse')
+    def scan(file_path):
+        calls.append(file_path)
+        with open(file_path) as f:
+            return f.read().split()
+
+    path = repo / 'a.txt'
+    path.write_text('one two')
+    assert scan(str(path)) == ['one', 'two']
+    assert scan(str(path)) == ['one', 'two']
+    assert len(calls) == 1
+
+    path.write_text('three')
+    assert scan(str(path)) == ['three']
+    assert len(calls) == 2
+
+
+def test_skip_caching_keeps_the_result_out(repo):
+    calls = []
+
+    @cached_by_stat('test-skip')
+    def scan(file_path):
+        calls.append(file_path)
+        if len(calls) == 1:
+            skip_caching()
+            return []
+        return ['found']
+
+    path = repo / 'a.txt'
+    path.write_text('x')
+    assert scan(str(path)) == []
+    assert cache_entries('test-skip') == []
+    assert scan(str(path)) == ['found']
+    assert scan(str(path)) == ['found']
+    assert len(calls) == 2
+
+
+def test_read_errors_are_not_cached(repo, capsys):
+    # A directory passes the stat the cache keys on, but cannot be read
+    path = repo / 'secrets.py'
+    path.mkdir()
+    assert credentials.find_hardcoded_credentials(str(path)) == []
+    assert 'Error reading' in capsys.readouterr().err
+    assert cache_entries('hardcoded-credentials') == []
+
+    clean = repo / 'clean.py'
+    clean.write_text('x = 1\n')
+    assert credentials.find_hardcoded_credentials(str(clean)) == []
+    assert len(cache_entries('hardcoded-credentials')) == 1
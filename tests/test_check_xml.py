@@ -0,0 +1,29 @@
+import pytest
+
+import check_xml
+
+LXML = pytest.param(True, marks=pytest.mark.skipif(check_xml.etree is None, reason='lxml is not installed'))
+
+
+@pytest.fixture(params=[LXML, False], ids=['lxml', 'stdlib'])
+def parser(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(check_xml, 'etree', None)
+
+
+@pytest.mark.parametrize('document', [
+    '<a>' * 300 + 'x' + '</a>' * 300,
+    '<a>' + 'x' * (11 * 1024 * 1024) + '</a>',
+], ids=['deep', 'long_text'])
+def test_valid_xml_beyond_libxml2_default_limits(parser, tmp_path, document):
+    path = tmp_path / 'doc.xml'
+    path.write_text(document)
+    assert check_xml.validate_xml_file(str(path)) == (True, None)
+
+
+def test_malformed_xml(parser, tmp_path):
+    path = tmp_path / 'bad.xml'
+    path.write_text('<a><b></a>')
+    is_valid, error_msg = check_xml.validate_xml_file(str(path))
+    assert not is_valid
+    assert error_msg
@@ -0,0 +1,134 @@
+import pytest
+
+import _patterns
+from _patterns import (BINARY_SNIFF_SIZE, BLOCK_SIZE, SeverityPatterns, compile_bytes_union, compile_gate,
+                       compile_patterns, gate_lines, read_text, scan_file)
+
+TABLE = {'flag': [r'needle\s*=\s*\d+']}
+PATTERN = compile_patterns(TABLE)['flag'][0]
+BYTES_GATE = compile_bytes_union(TABLE)
+
+RE2 = pytest.param('re2', marks=pytest.mark.skipif(_patterns.re2 is None, reason='google-re2 is not installed'))
+HYPERSCAN = pytest.param(
+    'hyperscan', marks=pytest.mark.skipif(_patterns.hyperscan is None, reason='hyperscan is not installed'))
+ENGINES = ['re', RE2, HYPERSCAN]
+
+NEWLINES = {'lf': b'\n', 'crlf': b'\r\n', 'cr': b'\r'}
+
+
+def expected_lines(data: bytes):
+    """(line_number, line) for the lines PATTERN matches, as read in text mode."""
+    text = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    return [(number, line) for number, line in enumerate(text.split('\n'), 1) if PATTERN.search(line)]
+
+
+def matching(lines):
+    """Keep the gated lines PATTERN matches, as the hooks' exact checks do."""
+    return [(number, line) for number, line in lines if PATTERN.search(line)]
+
+
+def seam_file(target: bytes, newline: bytes, offset: int) -> bytes:
+    """
+    Build a file a little over BLOCK_SIZE bytes whose `target` line starts
+    `offset` bytes before the first block boundary.  A second target line,
+    without a trailing newline, ends the file.
+    """
+    filler = b'x' * 63 + newline
+    start = BLOCK_SIZE - offset
+    head = filler * (start // len(filler) - 1)
+    head += b'y' * (start - len(head) - len(newline)) + newline
+    assert len(head) == start
+    return head + target + newline + filler * 3 + target
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('newline', NEWLINES.values(), ids=NEWLINES.keys())
+@pytest.mark.parametrize('target', ['needle = 1'.encode(), 'needle = 1 é'.encode()], ids=['ascii', 'utf8'])
+def test_scan_file_at_block_seams(tmp_path, engine, newline, target):
+    gate = compile_gate(TABLE, engine)
+    # Every split of the target line and its line break, including between
+    # \r and \n and inside the UTF-8 sequence
+    for offset in range(len(target + newline) + 1):
+        data = seam_file(target, newline, offset)
+        path = tmp_path / f'seam{offset}.txt'
+        path.write_bytes(data)
+        expected = expected_lines(data)
+        assert len(expected) == 2
+
+        for bytes_gate in (None, BYTES_GATE):
+            lines = list(scan_file(str(path), gate, bytes_gate))
+            assert matching(lines) == expected, (offset, bytes_gate)
+            if engine == 're':
+                assert lines == expected, (offset, bytes_gate)
+
+        assert matching(gate_lines(read_text(str(path)), gate)) == expected, offset
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_scan_file_counts_lines_of_ruled_out_blocks(tmp_path, engine):
+    # The first block mixes lone CR and LF line breaks and holds no match, so
+    # it is skipped undecoded; its line breaks still number the later lines
+    lines = BLOCK_SIZE // 64
+    data = (b'x' * 63 + b'\r') * lines + b'\n' + (b'y' * 63 + b'\n') * lines + b'needle = 1\n'
+    path = tmp_path / 'ruled_out.txt'
+    path.write_bytes(data)
+    gated = scan_file(str(path), compile_gate(TABLE, engine), BYTES_GATE, (b'needle',))
+    assert matching(gated) == expected_lines(data) == [(2 * lines + 1, 'needle = 1')]
+
+
+def test_nul_byte_skips_file(tmp_path):
+    path = tmp_path / 'blob.dat'
+    path.write_bytes(b'needle = 1\n\0\nneedle = 2\n')
+    assert list(scan_file(str(path), compile_gate(TABLE), BYTES_GATE)) == []
+    assert read_text(str(path)) == ''
+
+
+def test_nul_byte_past_sniffed_prefix_is_scanned(tmp_path):
+    data = b'x\n' * BINARY_SNIFF_SIZE + b'\0\nneedle = 1\n'
+    path = tmp_path / 'late_nul.txt'
+    path.write_bytes(data)
+    expected = [(BINARY_SNIFF_SIZE + 2, 'needle = 1')]
+    assert list(scan_file(str(path), compile_gate(TABLE), BYTES_GATE)) == expected
+    assert list(gate_lines(read_text(str(path)), compile_gate(TABLE))) == expected
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_bytes(b'')
+    assert list(scan_file(str(path), compile_gate(TABLE), BYTES_GATE)) == []
+    assert read_text(str(path)) == ''
+
+
+@pytest.mark.parametrize('engine', [RE2, HYPERSCAN])
+@pytest.mark.parametrize('table, line', [
+    # re's str \s also matches \v and the \x1c-\x1f separators
+    (TABLE, 'needle\x1c=\x1c1'),
+    (TABLE, 'needle\x0b=\x0b1'),
+    (TABLE, 'needle =\x1f1'),
+    # re's str \w also matches non-ASCII letters
+    ({'flag': [r'debug\w*\s*=']}, 'debugé = 1'),
+])
+def test_engine_blind_spot_lines_are_nominated(engine, table, line):
+    gate = compile_gate(table, engine)
+    assert gate[0] == engine
+    # re matches the line, the accelerated engines' ASCII-only classes do not
+    assert compile_gate(table)[1].search(line)
+    content = f'first\n{line}\nlast'
+    assert (2, line) in list(gate_lines(content, gate))
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_severity_patterns_leave_out_lower_levels(tmp_path, engine):
+    patterns = SeverityPatterns({'low': [r'debug\s*=\s*true'], 'high': [r'password\s*=']}, {'low': 1, 'high': 3})
+    path = tmp_path / 'settings.py'
+    path.write_text('debug = true\npassword = "x"\n')
+
+    compiled, literals, bytes_gate = patterns.active_patterns(1)
+    assert list(compiled) == list(literals) == ['low', 'high']
+    assert [number for number, _ in scan_file(str(path), patterns.line_gate(engine), bytes_gate)] == [1, 2]
+
+    compiled, literals, bytes_gate = patterns.active_patterns(3)
+    assert list(compiled) == list(literals) == ['high']
+    assert [number for number, _ in scan_file(str(path), patterns.line_gate(engine, 3), bytes_gate)] == [2]
+    assert patterns.active_patterns(3) is patterns.active_patterns(3)
+    assert patterns.line_gate(engine, 3) is patterns.line_gate(engine, 3)